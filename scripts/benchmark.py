@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+benchmark.py - Synthetic-calendar benchmarks for parse_calendar.py and find_meeting_times.py.
+
+Usage:
+    python benchmark.py [--people 5 25 100] [--events 20 200] [--days 5 20] [--repeat 3]
+                        [--jobs 2 4] [--output results.json] [--compare baseline.json]
+
+Generates deterministic Outlook/MCP-format exports (mixed busyStatus values,
+recurring and all-day events, 12- and 24-hour times) and times each pipeline
+stage across a sweep of people count, events per person and date-range length:
+
+    parse_calendar:      load_calendar_json, Event parsing, format_output
+    find_meeting_times:  get_busy_periods (serially and with each --jobs worker
+                         count), generate_time_slots, the analyze_slot loop and
+                         find_top_slots
+
+Results are written as JSON (min/median seconds per stage and case) so runs
+from different commits can be compared with --compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+import find_meeting_times
+import parse_calendar
+from calendar_model import Event, clear_parse_cache
+
+# Weighted busyStatus mix, roughly as seen in real exports
+STATUS_WEIGHTS = [("Busy", 60), ("Tentative", 15), ("Free", 12), ("Out of Office", 5),
+                  ("WorkingElsewhere", 8)]
+SUBJECTS = ["Standup", "1:1", "Design review", "Planning", "Customer call", "Lunch",
+            "Focus time", "All hands", "Interview", "Sync"]
+LOCATIONS = ["", "Microsoft Teams Meeting", "Building 50/3014", "Building 31/1200", "Cafe"]
+DURATIONS = [15, 25, 30, 30, 45, 60, 60, 90, 120]
+
+START_DATE = datetime(2026, 2, 2)
+SLOT_DURATION = 30
+FORMAT_VERSION = 1
+
+
+def format_12h(dt: datetime) -> str:
+    """Format like the MCP server: M/D/YYYY hh:mm AM/PM."""
+    return f"{dt.month}/{dt.day}/{dt.year} {dt.strftime('%I:%M %p')}"
+
+
+def format_24h(dt: datetime) -> str:
+    """Format as M/D/YYYY HH:MM, the other form parse_event_datetime accepts."""
+    return f"{dt.month}/{dt.day}/{dt.year} {dt.strftime('%H:%M')}"
+
+
+def _event(rng: random.Random, start: datetime, end: datetime, fmt: Callable,
+           subject: str, recurring: bool) -> dict:
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    return {
+        "subject": subject,
+        "start": fmt(start),
+        "end": fmt(end),
+        "location": rng.choice(LOCATIONS),
+        "organizer": f"Person {rng.randrange(50)}",
+        "isRecurring": recurring,
+        "recurrenceState": "occurrence" if recurring else "notRecurring",
+        "isMeeting": rng.random() < 0.8,
+        "busyStatus": rng.choices(statuses, weights)[0],
+    }
+
+
+def generate_events(rng: random.Random, count: int, days: int, fmt_24h_share: float = 0.0) -> list:
+    """
+    Generate count events spread over the days starting at START_DATE.
+
+    About a third of the events belong to weekly recurring series, a few are
+    all-day (midnight to midnight, sometimes multi-day) and the rest are
+    one-off meetings during and around working hours. fmt_24h_share is the
+    fraction of events written with 24-hour times.
+    """
+    events = []
+    while len(events) < count:
+        fmt = format_24h if rng.random() < fmt_24h_share else format_12h
+        kind = rng.random()
+        if kind < 0.05:
+            start = START_DATE + timedelta(days=rng.randrange(days))
+            end = start + timedelta(days=rng.choice([1, 1, 1, 2, 5]))
+            events.append(_event(rng, start, end, fmt, "Out of office", False))
+        elif kind < 0.35:
+            # Weekly series: same weekday and time every week of the range
+            first = START_DATE + timedelta(days=rng.randrange(min(days, 7)),
+                                           minutes=rng.randrange(8 * 60, 17 * 60, 30))
+            duration = timedelta(minutes=rng.choice(DURATIONS))
+            subject = rng.choice(SUBJECTS) + " (weekly)"
+            start = first
+            while start < START_DATE + timedelta(days=days) and len(events) < count:
+                events.append(_event(rng, start, start + duration, fmt, subject, True))
+                start += timedelta(weeks=1)
+        else:
+            start = START_DATE + timedelta(days=rng.randrange(days),
+                                           minutes=rng.randrange(7 * 60, 19 * 60, rng.choice([5, 15, 30])))
+            end = start + timedelta(minutes=rng.choice(DURATIONS))
+            events.append(_event(rng, start, end, fmt, rng.choice(SUBJECTS), False))
+    return events
+
+
+def write_mcp_export(path: str, events: list):
+    """Write events as an MCP listEvents response (text block holding the payload)."""
+    payload = {"startDate": format_12h(START_DATE).split()[0], "events": events,
+               "returned": len(events), "hasMore": False}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"type": "text", "text": json.dumps(payload)}], f)
+
+
+def time_call(func: Callable, repeat: int) -> tuple:
+    """
+    Run func repeat times; return (min/median seconds, the last result).
+    The datetime parse memo is emptied before each run so every run parses from scratch.
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        clear_parse_cache()
+        started = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - started)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}, result
+
+
+def bench_parse_calendar(workdir: str, events: int, days: int, repeat: int, seed: int) -> dict:
+    """Time the parse_calendar.py pipeline on one MCP export."""
+    rng = random.Random(f"{seed}:parse:{events}:{days}")
+    path = os.path.join(workdir, f"mcp_{events}_{days}.json")
+    write_mcp_export(path, generate_events(rng, events, days, fmt_24h_share=0.2))
+
+    start_date = START_DATE
+    end_date = START_DATE + timedelta(days=days - 1)
+    timings = {}
+    timings["load_calendar_json"], raw = time_call(lambda: parse_calendar.load_calendar_json(path), repeat)
+    timings["parse_events"], parsed = time_call(lambda: [Event.from_dict(e) for e in raw], repeat)
+    timings["filter"], selected = time_call(
+        lambda: [e for e in parsed if parse_calendar.event_in_date_range(e, start_date, end_date)], repeat)
+    for format_type in ("summary", "detailed"):
+        timings[f"format_output_{format_type}"], _ = time_call(
+            lambda: parse_calendar.format_output(selected, format_type), repeat)
+    return {
+        "case": {"events": events, "days": days},
+        "counts": {"events": len(raw), "selected": len(selected)},
+        "timings": timings,
+    }
+
+
+def bench_find_meeting_times(people: int, events: int, days: int, repeat: int, seed: int,
+                             jobs: list = ()) -> dict:
+    """Time the find_meeting_times.py pipeline on one set of attendee calendars."""
+    rng = random.Random(f"{seed}:find:{people}:{events}:{days}")
+    calendars = {f"Person {i}": generate_events(rng, events, days) for i in range(people)}
+    my_events = generate_events(rng, events, days)
+
+    start = START_DATE.strftime("%m%d%Y")
+    end = (START_DATE + timedelta(days=days - 1)).strftime("%m%d%Y")
+    timings = {}
+    timings["get_busy_periods"], busy = time_call(
+        lambda: {person: find_meeting_times.get_busy_periods(evs) for person, evs in calendars.items()},
+        repeat)
+    for count in jobs:
+        timings[f"get_busy_periods_jobs{count}"], _ = time_call(
+            lambda: {person: find_meeting_times.select_busy_periods(evs) for person, evs
+                     in find_meeting_times.parse_calendars_parallel(calendars, count, busy_only=True)},
+            repeat)
+    my_busy = find_meeting_times.get_busy_periods(my_events)
+    timings["generate_time_slots"], slots = time_call(
+        lambda: find_meeting_times.generate_time_slots(start, end, SLOT_DURATION), repeat)
+    timings["analyze_slot_loop"], _ = time_call(
+        lambda: [find_meeting_times.analyze_slot(s, e, busy, my_busy) for s, e in slots], repeat)
+    timings["find_top_slots"], _ = time_call(
+        lambda: find_meeting_times.find_top_slots(slots, busy, my_busy, 5), repeat)
+    return {
+        "case": {"people": people, "events": events, "days": days},
+        "counts": {"busy_periods": sum(len(p) for p in busy.values()), "slots": len(slots)},
+        "timings": timings,
+    }
+
+
+def git_revision() -> str:
+    """Commit the benchmarked scripts come from, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """Lines comparing median timings against a baseline results file."""
+    def medians(data: dict) -> dict:
+        return {
+            (suite, json.dumps(entry["case"], sort_keys=True), stage): timing["median"]
+            for suite in ("parse_calendar", "find_meeting_times")
+            for entry in data.get(suite, [])
+            for stage, timing in entry["timings"].items()
+        }
+
+    old = medians(baseline)
+    lines = []
+    for key, new_time in medians(results).items():
+        if key in old and old[key] > 0:
+            suite, case, stage = key
+            lines.append(f"{suite:<20} {case:<45} {stage:<26} {new_time / old[key]:6.2f}x")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the calendar scripts on synthetic data")
+    parser.add_argument("--people", type=int, nargs="+", default=[5, 25, 100],
+                        help="Attendee counts to sweep")
+    parser.add_argument("--events", type=int, nargs="+", default=[20, 200],
+                        help="Events per calendar to sweep")
+    parser.add_argument("--days", type=int, nargs="+", default=[5, 20],
+                        help="Date-range lengths in days to sweep")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument("--jobs", type=int, nargs="*", default=[2, 4],
+                        help="Worker counts to time get_busy_periods with, as find_meeting_times --jobs does")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data generator")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="Baseline results JSON to print speed ratios against")
+    args = parser.parse_args()
+
+    results = {
+        "format_version": FORMAT_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "parse_calendar": [],
+        "find_meeting_times": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for events in args.events:
+            for days in args.days:
+                print(f"parse_calendar events={events} days={days}", file=sys.stderr)
+                results["parse_calendar"].append(
+                    bench_parse_calendar(workdir, events, days, args.repeat, args.seed))
+
+    for people in args.people:
+        for events in args.events:
+            for days in args.days:
+                print(f"find_meeting_times people={people} events={events} days={days}", file=sys.stderr)
+                results["find_meeting_times"].append(
+                    bench_find_meeting_times(people, events, days, args.repeat, args.seed, args.jobs))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\nMedian time vs baseline (lower is faster):", file=sys.stderr)
+        for line in compare(results, baseline):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+calendar_cache.py - On-disk columnar cache of parsed calendar exports.
+
+Parsed events are stored as fixed-width int64 columns (start/end minutes,
+status, subject and location string ids, raw-event offsets) plus an interned
+UTF-8 string table and a blob of the raw event JSON. Cache files are keyed on
+the export's path, size, mtime and content hash, loaded with mmap, and evicted
+least-recently-used once the cache directory grows past a size limit.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from typing import Callable, Iterable, Optional, Sequence
+
+from calendar_model import Event, status_code
+
+MAGIC = b"MMCAL\x00\x00\x01"
+FORMAT_VERSION = 1
+CACHE_SUFFIX = ".mmcal"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# version, groups, events, strings, string blob bytes, raw blob bytes
+_HEADER = struct.Struct("<8s6q")
+# Stored in place of a start/end that did not parse, or a missing string
+_NONE = -(1 << 63)
+
+GroupSource = Callable[[], Iterable[tuple]]
+
+
+def default_cache_dir() -> str:
+    """Cache directory: $MAGICMEETING_CACHE_DIR, else the per-user cache location."""
+    path = os.environ.get("MAGICMEETING_CACHE_DIR")
+    if path:
+        return path
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "magicmeeting")
+
+
+def file_fingerprint(filepath: str) -> str:
+    """Hash of a file's absolute path, size, mtime and contents."""
+    stat = os.stat(filepath)
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    key = f"{os.path.abspath(filepath)}\0{stat.st_size}\0{stat.st_mtime_ns}\0{digest.hexdigest()}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class CachedEvent(Event):
+    """An Event read from a cache file; the raw event dict is decoded on first use."""
+
+    __slots__ = ("_table", "_index", "_raw")
+
+    def __init__(self, table: "CachedCalendar", index: int):
+        self._table = table
+        self._index = index
+        self._raw = None
+        start = table.starts[index]
+        end = table.ends[index]
+        self.start = None if start == _NONE else start
+        self.end = None if end == _NONE else end
+        self.status = table.status_code(table.statuses[index])
+        self.subject = table.string(table.subjects[index])
+        self.location = table.string(table.locations[index])
+
+    @property
+    def raw(self) -> dict:
+        if self._raw is None:
+            self._raw = self._table.raw_event(self._index)
+        return self._raw
+
+
+class CachedEvents(Sequence):
+    """Read-only sequence of the cached events in one group."""
+
+    def __init__(self, table: "CachedCalendar", lo: int, hi: int):
+        self.table = table
+        self.lo = lo
+        self.hi = hi
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def columns(self) -> tuple:
+        """Return the (starts, ends) minutes of the group as lists, None where unparsed."""
+        return tuple([None if value == _NONE else value for value in column[self.lo:self.hi]]
+                     for column in (self.table.starts, self.table.ends))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return CachedEvent(self.table, self.lo + index)
+
+
+class CachedCalendar:
+    """A memory-mapped cache file holding named groups of parsed events."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, n_groups, n_events, n_strings, strings_len, raw_len = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a calendar cache file: {path}")
+
+        offset = _HEADER.size
+
+        def column(count: int) -> memoryview:
+            nonlocal offset
+            data = view[offset:offset + 8 * count].cast("q")
+            offset += 8 * count
+            return data
+
+        group_names = column(n_groups)
+        group_offsets = column(n_groups + 1)
+        self.starts = column(n_events)
+        self.ends = column(n_events)
+        self.statuses = column(n_events)
+        self.subjects = column(n_events)
+        self.locations = column(n_events)
+        self._string_offsets = column(n_strings + 1)
+        self._raw_offsets = column(n_events + 1)
+        self._strings_base = offset
+        self._raw_base = offset + _padded(strings_len)
+        if self._raw_base + raw_len != len(view):
+            raise ValueError(f"Truncated calendar cache file: {path}")
+
+        self._view = view
+        self._strings = [None] * n_strings
+        self._status_codes = {}
+        self.groups = [
+            (self.string(group_names[i]), CachedEvents(self, group_offsets[i], group_offsets[i + 1]))
+            for i in range(n_groups)
+        ]
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decode an interned string (None for the missing-string id)."""
+        if string_id == _NONE:
+            return None
+        value = self._strings[string_id]
+        if value is None:
+            lo = self._strings_base + self._string_offsets[string_id]
+            hi = self._strings_base + self._string_offsets[string_id + 1]
+            value = self._strings[string_id] = str(self._view[lo:hi], "utf-8", "surrogatepass")
+        return value
+
+    def status_code(self, string_id: int) -> int:
+        """Map a cached status string id to this process's interned status code."""
+        code = self._status_codes.get(string_id)
+        if code is None:
+            code = self._status_codes[string_id] = status_code(self.string(string_id))
+        return code
+
+    def raw_event(self, index: int) -> dict:
+        """Decode the original event dict of one cached event."""
+        lo = self._raw_base + self._raw_offsets[index]
+        hi = self._raw_base + self._raw_offsets[index + 1]
+        return json.loads(str(self._view[lo:hi], "utf-8"))
+
+
+def _padded(size: int) -> int:
+    return -(-size // 8) * 8
+
+
+def write_cache(path: str, groups: Iterable[tuple]):
+    """
+    Write (group name, events) pairs to a cache file.
+
+    Events are consumed as they are produced and their raw JSON is spooled to
+    a temporary file, so only the fixed-width columns are held in memory.
+    """
+    strings = {}
+    string_blob = bytearray()
+    string_offsets = array("q", [0])
+
+    def intern(value) -> int:
+        if value is None:
+            return _NONE
+        value = str(value)
+        string_id = strings.get(value)
+        if string_id is None:
+            string_id = strings[value] = len(strings)
+            string_blob.extend(value.encode("utf-8", "surrogatepass"))
+            string_offsets.append(len(string_blob))
+        return string_id
+
+    group_names = array("q")
+    group_offsets = array("q", [0])
+    starts, ends, statuses, subjects, locations = (array("q") for _ in range(5))
+    raw_offsets = array("q", [0])
+
+    directory = os.path.dirname(path)
+    with tempfile.TemporaryFile(dir=directory) as raw_blob:
+        for name, events in groups:
+            for event in events:
+                starts.append(_NONE if event.start is None else event.start)
+                ends.append(_NONE if event.end is None else event.end)
+                statuses.append(intern(event.status_name))
+                subjects.append(intern(event.subject))
+                locations.append(intern(event.location))
+                raw = json.dumps(event.raw).encode("ascii")
+                raw_blob.write(raw)
+                raw_offsets.append(raw_offsets[-1] + len(raw))
+            group_names.append(intern(name))
+            group_offsets.append(len(starts))
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(group_names), len(starts),
+                                     len(strings), len(string_blob), raw_offsets[-1]))
+                for column in (group_names, group_offsets, starts, ends, statuses,
+                               subjects, locations, string_offsets, raw_offsets):
+                    column.tofile(f)
+                f.write(string_blob)
+                f.write(b"\0" * (_padded(len(string_blob)) - len(string_blob)))
+                raw_blob.seek(0)
+                for block in iter(lambda: raw_blob.read(1 << 20), b""):
+                    f.write(block)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def evict_cache(cache_dir: str, max_bytes: int, keep: str = None):
+    """Delete least-recently-used cache files until the directory fits in max_bytes."""
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if keep and os.path.samefile(path, keep):
+            continue
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            # Still mapped by another process (Windows), or already gone
+            continue
+
+
+def open_cache(filepath: str, kind: str, build: GroupSource, cache_dir: str = None,
+               max_bytes: int = DEFAULT_MAX_BYTES) -> Optional[CachedCalendar]:
+    """
+    Return the cached parse of filepath, building it with build() on a miss.
+
+    kind names the loader (and its datetime formats) so different parses of
+    the same file don't collide. build returns (group name, events) pairs.
+    Returns None if the cache directory can't be used; errors reading or
+    parsing filepath itself propagate.
+    """
+    fingerprint = file_fingerprint(filepath)
+    cache_dir = cache_dir or default_cache_dir()
+    key = hashlib.blake2b(f"{FORMAT_VERSION}\0{kind}\0{fingerprint}".encode("utf-8"), digest_size=16)
+    path = os.path.join(cache_dir, key.hexdigest() + CACHE_SUFFIX)
+
+    try:
+        cached = CachedCalendar(path)
+        # Refresh the mtime so LRU eviction sees this entry as recently used
+        os.utime(path)
+        return cached
+    except (OSError, ValueError, struct.error):
+        pass
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_cache(path, build())
+        evict_cache(cache_dir, max_bytes, keep=path)
+        return CachedCalendar(path)
+    except OSError:
+        return None
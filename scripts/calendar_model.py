@@ -0,0 +1,172 @@
+"""
+calendar_model.py - Compact parsed event records shared by the calendar scripts.
+
+Every Outlook event is parsed exactly once into an Event: start and end become
+integer minutes since 1970-01-01 (naive local time, as exported by Outlook)
+and busyStatus becomes an interned status code. parse_calendar.py and
+find_meeting_times.py both work on these records instead of re-parsing the
+raw 'M/D/YYYY hh:mm AM/PM' strings.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+EPOCH = datetime(1970, 1, 1)
+MINUTES_PER_DAY = 24 * 60
+
+# Formats accepted for event start/end strings
+OUTLOOK_FORMATS = ("%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M")
+
+# Formats the fast parser recognizes by shape, keyed by (has time, has AM/PM)
+_FAST_FORMATS = {
+    (True, True): "%m/%d/%Y %I:%M %p",
+    (True, False): "%m/%d/%Y %H:%M",
+    (False, False): "%m/%d/%Y",
+}
+_FAST_FORMAT_SET = frozenset(_FAST_FORMATS.values())
+_OUTLOOK_DATETIME = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?: (\d{1,2}):(\d\d)(?: ([AP]M))?)?", re.ASCII)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+# Distinct datetime strings remembered by parse_minutes; recurring series repeat times
+PARSE_CACHE_SIZE = 1 << 16
+
+# Interned busyStatus values; codes are indexes into STATUS_NAMES
+STATUS_NAMES = ["Busy", "Tentative", "Free", "Out of Office", "WorkingElsewhere"]
+_STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+def to_minutes(dt: datetime) -> int:
+    """Convert a naive datetime to minutes since the epoch."""
+    return (dt - EPOCH) // timedelta(minutes=1)
+
+
+def from_minutes(minutes: int) -> datetime:
+    """Convert minutes since the epoch back to a naive datetime."""
+    return EPOCH + timedelta(minutes=minutes)
+
+
+def _fast_parse(dt_str: str) -> Optional[tuple]:
+    """
+    Parse the common Outlook shapes (M/D/YYYY, with hh:mm and optionally AM/PM) directly.
+
+    Returns (format, epoch minutes) for strings strptime would accept with
+    that format, or None for anything else, including unusual spellings
+    strptime might still accept; callers fall back to strptime for those.
+    """
+    match = _OUTLOOK_DATETIME.fullmatch(dt_str)
+    if match is None:
+        return None
+    month, day, year, hour, minute, meridiem = match.groups()
+    if hour is None:
+        hour = minute = 0
+    else:
+        hour = int(hour)
+        minute = int(minute)
+        if minute > 59:
+            return None
+        if meridiem is None:
+            if hour > 23:
+                return None
+        elif not 1 <= hour <= 12:
+            return None
+        else:
+            hour = hour % 12 + (12 if meridiem == "PM" else 0)
+    try:
+        ordinal = date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+    fmt = _FAST_FORMATS[(match.group(4) is not None, meridiem is not None)]
+    return fmt, (ordinal - _EPOCH_ORDINAL) * MINUTES_PER_DAY + hour * 60 + minute
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_minutes(dt_str: str, formats: tuple) -> Optional[int]:
+    # The shapes are disjoint, so when every format is one the fast parser
+    # knows, the shape it detects is the first format strptime would match
+    if _FAST_FORMAT_SET.issuperset(formats):
+        parsed = _fast_parse(dt_str)
+        if parsed is not None and parsed[0] in formats:
+            return parsed[1]
+    for fmt in formats:
+        try:
+            return to_minutes(datetime.strptime(dt_str, fmt))
+        except ValueError:
+            continue
+    return None
+
+
+def parse_minutes(dt_str: str, formats: tuple = OUTLOOK_FORMATS) -> Optional[int]:
+    """
+    Parse an event datetime string to epoch minutes, or None if no format matches.
+
+    Same result as trying datetime.strptime with each format in turn, but
+    Outlook's M/D/YYYY forms are parsed directly and repeated strings are
+    answered from a bounded memo.
+    """
+    if not isinstance(dt_str, str):
+        return None
+    return _parse_minutes(dt_str, formats)
+
+
+def clear_parse_cache():
+    """Empty parse_minutes' memo, e.g. so repeated benchmark runs each parse from scratch."""
+    _parse_minutes.cache_clear()
+
+
+def status_code(name: str) -> int:
+    """Return the interned code for a busyStatus value, registering new values."""
+    code = _STATUS_CODES.get(name)
+    if code is None:
+        code = _STATUS_CODES[name] = len(STATUS_NAMES)
+        STATUS_NAMES.append(name)
+    return code
+
+
+def status_name(code: int) -> str:
+    """Return the busyStatus value for an interned status code."""
+    return STATUS_NAMES[code]
+
+
+class Event:
+    """
+    A calendar event parsed once into epoch minutes and a status code.
+
+    start/end are None when the source string could not be parsed. subject and
+    location are the raw values (None when missing); raw keeps the original
+    event dict for detailed and JSON output.
+    """
+
+    __slots__ = ("start", "end", "status", "subject", "location", "raw")
+
+    def __init__(self, start: Optional[int], end: Optional[int], status: int,
+                 subject: Optional[str] = None, location: Optional[str] = None,
+                 raw: Optional[dict] = None):
+        self.start = start
+        self.end = end
+        self.status = status
+        self.subject = subject
+        self.location = location
+        self.raw = raw
+
+    @classmethod
+    def from_dict(cls, event: dict, formats: tuple = OUTLOOK_FORMATS) -> "Event":
+        """Parse a raw Outlook event dict."""
+        return cls(
+            parse_minutes(event.get("start"), formats),
+            parse_minutes(event.get("end"), formats),
+            status_code(event.get("busyStatus", "Busy")),
+            event.get("subject"),
+            event.get("location"),
+            event,
+        )
+
+    @property
+    def status_name(self) -> str:
+        return STATUS_NAMES[self.status]
+
+    def get(self, key: str, default=None):
+        """Look up a field of the original event dict."""
+        if self.raw is None:
+            return default
+        return self.raw.get(key, default)
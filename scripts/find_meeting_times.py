@@ -5,6 +5,15 @@ Analyzes availability to find slots where the most people are free.
 
 Usage:
     python find_meeting_times.py <calendars_json> --duration 60 --top 5 --my-calendar <my_calendar_json>
+    python find_meeting_times.py <calendars_json> --durations 25 30 50 60 --step 5 --top 5
+    python find_meeting_times.py --free-busy <free_busy_json> --start MMDDYYYY --end MMDDYYYY
+    python find_meeting_times.py <calendars_json> --rooms <rooms_json> [--building 50] [--floor 3] [--capacity 8] ...
+    python find_meeting_times.py <calendars_json> --recurring weekly --weeks 12 --start MMDDYYYY --duration 30
+    python find_meeting_times.py [<calendars_json>] --serve [--my-calendar <my_calendar_json>]
+
+--serve keeps calendars in memory and answers newline-delimited JSON-RPC 2.0
+requests on stdin/stdout: load, status, find_slots, set_person, set_free_busy,
+patch_person, remove_person, set_my_calendar and shutdown.
 
 Input format: JSON file with structure:
 {
@@ -12,68 +21,820 @@ Input format: JSON file with structure:
     ...
 }
 
+--free-busy FILE adds attendees from raw Outlook free/busy strings (one
+status digit per minutesPerChar minutes; see load_free_busy), which skips
+per-event parsing when meeting subjects aren't needed.
+
 Output: Top N time slots with availability analysis.
+
+--recurring weekly --weeks N looks for a slot that repeats every week for N
+weeks from --start, ranked by how many people can make every week and then
+by availability summed over the weeks.
+
+Parsed calendars are cached on disk between runs (see calendar_cache.py);
+pass --no-cache to bypass the cache. --jobs N parses uncached calendars in N
+forked worker processes. --profile reports per-phase timings and memory (see profiling.py).
 """
 
 import json
 import argparse
+import bisect
+import heapq
+import inspect
+import multiprocessing
+import re
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Optional
+from collections import OrderedDict, defaultdict
+from math import gcd
+from typing import Iterable, Optional
+
+from calendar_cache import open_cache
+from calendar_model import (MINUTES_PER_DAY, STATUS_NAMES, Event, from_minutes, parse_minutes, status_code, status_name,
+                            to_minutes)
+from profiling import DISABLED, PhaseProfiler, add_profile_arguments, finish_profile, profiler_from_args
+
+# Formats accepted for event start/end strings
+EVENT_FORMATS = ("%m/%d/%Y %I:%M %p", "%m/%d/%Y")
+
+FREE_STATUS = status_code('Free')
+
+# Finest start-time step accepted by --step
+MIN_STEP_MINUTES = 5
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Stored in parsed-time arrays for a start/end that did not parse
+_UNPARSED = -(1 << 63)
+# Work items handed to each worker process for --jobs
+CHUNKS_PER_JOB = 4
+# The (person, events) list forked --jobs workers read, set only while they run
+_WORKER_PEOPLE = None
 
 
 def parse_date(date_str: str) -> Optional[datetime]:
     """Parse date string in M/D/YYYY H:MM AM/PM format."""
-    try:
-        return datetime.strptime(date_str, "%m/%d/%Y %I:%M %p")
-    except ValueError:
-        try:
-            return datetime.strptime(date_str, "%m/%d/%Y")
-        except ValueError:
-            return None
+    minutes = parse_minutes(date_str, EVENT_FORMATS)
+    return None if minutes is None else from_minutes(minutes)
 
 
-def get_busy_periods(events: list) -> list:
-    """Extract busy/tentative periods from events."""
+def select_busy_periods(events: Iterable[Event]) -> list:
+    """Keep the parsed events that block time: not Free, with a start and end."""
     periods = []
-    for event in events:
-        status = event.get('busyStatus', 'Busy')
-        if status in ('Free',):
+    for period in events:
+        if period.status == FREE_STATUS:
             continue
-        start = parse_date(event.get('start', ''))
-        end = parse_date(event.get('end', ''))
-        if start and end:
-            periods.append({
-                'start': start,
-                'end': end,
-                'status': status,
-                'subject': event.get('subject', 'Busy')
-            })
+        if period.start is not None and period.end is not None:
+            periods.append(period)
     return periods
 
 
+def get_busy_periods(events: list) -> list:
+    """Extract busy/tentative periods from events as parsed Event records."""
+    return select_busy_periods(Event.from_dict(event, EVENT_FORMATS) for event in events)
+
+
+def _load_groups(filepath: str, kind: str, build, use_cache: bool, cache_dir: str = None) -> list:
+    """Return (name, events) groups via the on-disk cache, or from build() if it is off or unusable."""
+    cache = None
+    if use_cache:
+        cache = open_cache(filepath, f"find_meeting_times:{kind}:" + "|".join(EVENT_FORMATS), build, cache_dir)
+    return cache.groups if cache is not None else build()
+
+
+def _normalize_people(bounds: tuple, busy_only: bool) -> tuple:
+    """
+    Worker for parallel ingestion: parse and classify people lo..hi of _WORKER_PEOPLE.
+
+    Returns per person packed (indexes, starts, ends, statuses) columns, where
+    indexes point into that person's raw event list and unparsed times are
+    _UNPARSED, plus this process's STATUS_NAMES to map the status codes back.
+    With busy_only, only the events select_busy_periods would keep are listed.
+    """
+    lo, hi = bounds
+    results = []
+    for _, events in _WORKER_PEOPLE[lo:hi]:
+        indexes, starts, ends, statuses = array('l'), array('q'), array('q'), array('l')
+        for i, event in enumerate(events):
+            start = parse_minutes(event.get('start'), EVENT_FORMATS)
+            end = parse_minutes(event.get('end'), EVENT_FORMATS)
+            status = status_code(event.get('busyStatus', 'Busy'))
+            if busy_only and (status == FREE_STATUS or start is None or end is None):
+                continue
+            indexes.append(i)
+            starts.append(_UNPARSED if start is None else start)
+            ends.append(_UNPARSED if end is None else end)
+            statuses.append(status)
+        results.append((indexes, starts, ends, statuses))
+    return results, list(STATUS_NAMES)
+
+
+def _split_chunks(items: list, sizes: list, count: int) -> list:
+    """Split items into at most count contiguous chunks of roughly equal total size."""
+    target = max(sum(sizes) / count, 1)
+    chunks = [[]]
+    filled = 0
+    for item, size in zip(items, sizes):
+        if filled >= target and len(chunks) < count:
+            chunks.append([])
+            filled = 0
+        chunks[-1].append(item)
+        filled += size
+    return chunks
+
+
+def parse_calendars_parallel(calendars: dict, jobs: int, busy_only: bool = False) -> list:
+    """
+    Parse a {person: [events]} dict into (person, [Event]) groups with a process pool.
+
+    Workers are forked, so they read the already-loaded calendars without
+    pickling them, and do all the per-event work: parsing times, interning
+    statuses and, with busy_only, dropping what select_busy_periods would.
+    Only packed columns come back; here each kept event just gets its raw
+    dict attached, in file order, so the result is identical to
+    Event.from_dict. Where fork isn't available (Windows), shipping the
+    events to spawned workers costs more than it saves, so they are
+    normalized in this process instead.
+    """
+    global _WORKER_PEOPLE
+    people = list(calendars.items())
+    _WORKER_PEOPLE = people
+    try:
+        if 'fork' in multiprocessing.get_all_start_methods():
+            sizes = [len(events) for _, events in people]
+            chunks = _split_chunks(range(len(people)), sizes, jobs * CHUNKS_PER_JOB)
+            bounds = [(chunk[0], chunk[-1] + 1) for chunk in chunks if chunk]
+            with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('fork')) as executor:
+                # map() yields chunks in submission order, keeping people in file order
+                chunk_results = list(executor.map(_normalize_people, bounds, [busy_only] * len(bounds)))
+        else:
+            chunk_results = [_normalize_people((0, len(people)), busy_only)]
+    finally:
+        _WORKER_PEOPLE = None
+
+    groups = []
+    people_iter = iter(people)
+    for results, names in chunk_results:
+        codes = [status_code(name) for name in names]
+        # results comes first so zip stops without taking the next chunk's person
+        for (indexes, starts, ends, statuses), (person, events) in zip(results, people_iter):
+            group = []
+            for i, start, end, status in zip(indexes, starts, ends, statuses):
+                event = events[i]
+                group.append(Event(None if start == _UNPARSED else start, None if end == _UNPARSED else end,
+                                   codes[status], event.get('subject'), event.get('location'), event))
+            groups.append((person, group))
+    return groups
+
+
+def load_people_busy_periods(filepath: str, use_cache: bool = True, cache_dir: str = None,
+                             jobs: int = 1) -> dict:
+    """
+    Load a {person: [events]} calendars file into busy periods per person.
+    With jobs > 1, calendars that aren't already cached are parsed in that many processes.
+    """
+    def build():
+        with open(filepath, 'r', encoding='utf-8') as f:
+            calendars = json.load(f)
+        if jobs > 1 and len(calendars) > 1:
+            # Uncached, only the busy periods are needed; the cache stores every event
+            return parse_calendars_parallel(calendars, jobs, busy_only=not use_cache)
+        return [(person, (Event.from_dict(event, EVENT_FORMATS) for event in events))
+                for person, events in calendars.items()]
+
+    groups = _load_groups(filepath, 'people', build, use_cache, cache_dir)
+    return {person: select_busy_periods(events) for person, events in groups}
+
+
+def load_my_busy_periods(filepath: str, use_cache: bool = True, cache_dir: str = None) -> list:
+    """Load my calendar (plain event list or MCP response) into busy periods."""
+    def build():
+        with open(filepath, 'r', encoding='utf-8') as f:
+            my_data = json.load(f)
+        # Handle MCP response format
+        if isinstance(my_data, list) and len(my_data) > 0 and 'text' in my_data[0]:
+            my_events = json.loads(my_data[0]['text'])
+        else:
+            my_events = my_data
+        return [('', (Event.from_dict(event, EVENT_FORMATS) for event in my_events))]
+
+    groups = _load_groups(filepath, 'mine', build, use_cache, cache_dir)
+    return select_busy_periods(groups[0][1])
+
+
+# Outlook free/busy digits: free, tentative, busy, out of office, working elsewhere
+FREE_BUSY_CLASSES = ('free', 'tentative', 'busy', 'ooo', 'busy')
+# Precedence when one window covers several statuses
+FREE_BUSY_SEVERITY = ('ooo', 'busy', 'tentative')
+_FREE_BUSY_DIGITS = re.compile(r'[0-4]*')
+_FREE_BUSY_RUNS = re.compile(r'([1-4])\1*')
+
+
+class FreeBusy:
+    """
+    An attendee's compact Outlook free/busy string (AddressEntry.GetFreeBusy):
+    one status digit per minutes_per_char minutes from start (epoch minutes).
+
+    Stands in for a list of busy periods in people_busy_periods when meeting
+    subjects aren't needed. A window that covers several statuses takes the
+    most severe one (OOF, then busy, then tentative); time past the end of
+    the string counts as free.
+    """
+
+    __slots__ = ('start', 'minutes_per_char', 'digits')
+
+    def __init__(self, start: int, minutes_per_char: int, digits: str):
+        if minutes_per_char <= 0:
+            raise ValueError('minutesPerChar must be positive')
+        if not _FREE_BUSY_DIGITS.fullmatch(digits):
+            raise ValueError('Free/busy strings may only contain the digits 0-4')
+        self.start = start
+        self.minutes_per_char = minutes_per_char
+        self.digits = digits
+
+    def runs(self) -> Iterable[tuple]:
+        """Yield (status class, start, end) in epoch minutes for each run of non-free digits."""
+        for match in _FREE_BUSY_RUNS.finditer(self.digits):
+            yield (FREE_BUSY_CLASSES[int(match.group(1))],
+                   self.start + match.start() * self.minutes_per_char,
+                   self.start + match.end() * self.minutes_per_char)
+
+    def status(self, start: int, end: int) -> str:
+        """Status class for epoch minutes [start, end)."""
+        first = max((start - self.start) // self.minutes_per_char, 0)
+        last = max(-((self.start - end) // self.minutes_per_char), 0)
+        covered = {FREE_BUSY_CLASSES[int(digit)] for digit in self.digits[first:last]}
+        for status in FREE_BUSY_SEVERITY:
+            if status in covered:
+                return status
+        return 'free'
+
+
+def load_free_busy(filepath: str) -> dict:
+    """
+    Load attendees' free/busy strings from a JSON file like
+    {"startDate": "2/2/2026", "minutesPerChar": 30, "freeBusy": {"Name": "0022110...", ...}}.
+    An attendee's value may also be an object with its own freeBusy, startDate
+    and minutesPerChar.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    def parse_start(value) -> int:
+        start = parse_minutes(value, EVENT_FORMATS)
+        if start is None:
+            raise ValueError(f'Invalid free/busy startDate: {value!r}')
+        return start
+
+    default_start = data.get('startDate')
+    default_minutes = data.get('minutesPerChar', 30)
+    people = {}
+    for person, entry in data.get('freeBusy', {}).items():
+        if isinstance(entry, str):
+            entry = {'freeBusy': entry}
+        people[person] = FreeBusy(parse_start(entry.get('startDate', default_start)),
+                                  int(entry.get('minutesPerChar', default_minutes)),
+                                  entry['freeBusy'])
+    return people
+
+
+_NAME_TOKENS = re.compile(r'[^\W_]+')
+# Room numbers are {floor}{3 digits}, e.g. 3014 is room 014 on floor 3
+_ROOM_NUMBER = re.compile(r'\d{4,}')
+# Capacity written after the name, e.g. "Building 50/3014 (8)"
+_ROOM_CAPACITY = re.compile(r'\((\d+)\)\s*$')
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _room_floor(name: str, entry: dict) -> Optional[int]:
+    """A room's "floor" field, else the floor of the room number in its name; None if unknown."""
+    if entry.get('floor') is not None:
+        return _int_or_none(entry['floor'])
+    numbers = _ROOM_NUMBER.findall(name)
+    return int(numbers[-1]) // 1000 if numbers else None
+
+
+def _room_capacity(name: str, entry: dict) -> Optional[int]:
+    """A room's "capacity" field, else the "(N)" after its name; None if unknown."""
+    if entry.get('capacity') is not None:
+        return _int_or_none(entry['capacity'])
+    match = _ROOM_CAPACITY.search(name)
+    return int(match.group(1)) if match else None
+
+
+def load_rooms(filepath: str, building: str = None, floor: int = None, capacity: int = None) -> dict:
+    """
+    Load room calendars, keeping rooms in the given building, on the given
+    floor and seating at least capacity people.
+
+    The file maps room names to an event list (like calendars_json) or to an
+    object with optional "building", "floor" and "capacity" fields plus either
+    "events" or a "freeBusy" string (with "startDate" and "minutesPerChar").
+    Missing fields are read from the name the way findAvailableRooms.vbs
+    does: the building is a whole word or number in it ("50" matches
+    "Building 50/3014" but not "Building 500/1"), the floor comes from
+    the {floor}{3 digits} room number (3 for 3014), and the capacity
+    is a trailing "(8)". Buildings compare as case-insensitive text, floors
+    and capacities as integers; rooms whose value is unknown are dropped by
+    that filter.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    rooms = {}
+    for name, entry in data.items():
+        if isinstance(entry, list):
+            entry = {'events': entry}
+        if building is not None:
+            wanted = building.strip().lower()
+            room_building = entry.get('building')
+            if room_building is None:
+                if wanted not in _NAME_TOKENS.findall(name.lower()):
+                    continue
+            elif str(room_building).strip().lower() != wanted:
+                continue
+        if floor is not None and _room_floor(name, entry) != floor:
+            continue
+        if capacity is not None and (_room_capacity(name, entry) or 0) < capacity:
+            continue
+        if 'freeBusy' in entry:
+            start = parse_minutes(entry.get('startDate'), EVENT_FORMATS)
+            if start is None:
+                raise ValueError(f"Invalid startDate for room {name}: {entry.get('startDate')!r}")
+            rooms[name] = FreeBusy(start, int(entry.get('minutesPerChar', 30)), entry['freeBusy'])
+        else:
+            rooms[name] = get_busy_periods(entry.get('events', []))
+    return rooms
+
+
+def period_subject(period: Event) -> str:
+    """Subject of a busy period, defaulting to 'Busy'."""
+    return period.subject if period.subject is not None else 'Busy'
+
+
+def classify_status(status: str) -> str:
+    """Map an Outlook busyStatus to 'ooo', 'tentative' or 'busy'."""
+    status = status.lower()
+    if 'out' in status or 'oof' in status:
+        return 'ooo'
+    elif 'tentative' in status:
+        return 'tentative'
+    else:
+        return 'busy'
+
+
+_STATUS_CLASSES = {}
+
+
+def status_class(code: int) -> str:
+    """classify_status for an interned status code, memoized per code."""
+    result = _STATUS_CLASSES.get(code)
+    if result is None:
+        result = _STATUS_CLASSES[code] = classify_status(status_name(code))
+    return result
+
+
 def is_person_available(periods: list, slot_start: datetime, slot_end: datetime) -> tuple:
     """
     Check if person is available during a time slot.
     Returns (availability_status, conflicting_event_or_none)
     Status: 'free', 'tentative', 'busy', 'ooo'
+    For a FreeBusy attendee there is no conflicting event, so it is always None.
     """
+    start = to_minutes(slot_start)
+    end = to_minutes(slot_end)
+    if isinstance(periods, FreeBusy):
+        return (periods.status(start, end), None)
     for period in periods:
         # Check for overlap
-        if period['start'] < slot_end and period['end'] > slot_start:
-            status = period['status'].lower()
-            if 'out' in status or 'oof' in status.lower():
-                return ('ooo', period)
-            elif 'tentative' in status:
-                return ('tentative', period)
-            else:
-                return ('busy', period)
+        if period.start < end and period.end > start:
+            return (status_class(period.status), period)
     return ('free', None)
 
 
+class PeriodIndex:
+    """
+    One person's busy periods indexed by start time for first-match lookups.
+
+    first_overlap() returns the same period is_person_available would (the
+    first in list order overlapping the window) while checking only periods
+    that start within one period length before the window. Periods longer
+    than LONG_PERIOD_MINUTES, such as multi-day OOO, are few and are scanned
+    separately so they don't widen every lookup.
+
+    List order is kept as a sequence number per period, so add() and
+    remove() can follow a list that has periods appended and taken out
+    without rebuilding the index.
+    """
+
+    LONG_PERIOD_MINUTES = MINUTES_PER_DAY
+
+    def __init__(self, periods: list):
+        self.long = []
+        short = []
+        for seq, period in enumerate(periods):
+            if period.end - period.start > self.LONG_PERIOD_MINUTES:
+                self.long.append((seq, period))
+            else:
+                short.append((period.start, seq))
+        short.sort()
+        self.starts = [start for start, _ in short]
+        self.order = [seq for _, seq in short]
+        self.periods = [periods[seq] for seq in self.order]
+        # Inverted periods count as zero length: they still start after the window start
+        self.max_length = max((period.end - period.start for period in self.periods), default=0)
+        self.max_length = max(self.max_length, 0)
+        self.next_seq = len(periods)
+
+    def add(self, period: Event):
+        """Index a period appended to the end of the list."""
+        seq = self.next_seq
+        self.next_seq += 1
+        if period.end - period.start > self.LONG_PERIOD_MINUTES:
+            self.long.append((seq, period))
+            return
+        position = bisect.bisect_right(self.starts, period.start)
+        self.starts.insert(position, period.start)
+        self.order.insert(position, seq)
+        self.periods.insert(position, period)
+        self.max_length = max(self.max_length, period.end - period.start)
+
+    def remove(self, period: Event):
+        """Drop a period (the same object) taken out of the list."""
+        if period.end - period.start > self.LONG_PERIOD_MINUTES:
+            self.long = [entry for entry in self.long if entry[1] is not period]
+            return
+        lo = bisect.bisect_left(self.starts, period.start)
+        hi = bisect.bisect_right(self.starts, period.start)
+        for position in range(lo, hi):
+            if self.periods[position] is period:
+                del self.starts[position], self.order[position], self.periods[position]
+                # max_length stays an upper bound, which only widens lookups
+                return
+
+    def first_overlap(self, start: int, end: int) -> Optional[Event]:
+        """First period in list order overlapping epoch minutes [start, end), or None."""
+        best = best_period = None
+        for seq, period in self.long:
+            if period.start < end and period.end > start:
+                best, best_period = seq, period
+                break
+        order = self.order
+        periods = self.periods
+        lo = bisect.bisect_left(self.starts, start - self.max_length + 1)
+        hi = bisect.bisect_left(self.starts, end)
+        for position in range(lo, hi):
+            if (best is None or order[position] < best) and periods[position].end > start:
+                best, best_period = order[position], periods[position]
+        return best_period
+
+
+# Per-slot status codes used by SlotBoard and AvailabilityGrid.person_statuses
+SLOT_STATUSES = ('free', 'tentative', 'busy', 'ooo')
+SLOT_STATUS_INDEX = {status: index for index, status in enumerate(SLOT_STATUSES)}
+FREE, TENTATIVE, BUSY, OOO = range(4)
+
+
+def _window_any(plane: int, width: int) -> int:
+    """Bit i of the result is set if any of bits i..i+width-1 of plane are set."""
+    result = plane
+    span = 1
+    while span < width:
+        step = min(span, width - span)
+        result |= result >> step
+        span += step
+    return result
+
+
+def _add_to_counter(counter: list, mask: int):
+    """Add one to every bit position set in mask (bit-sliced counter, LSB plane first)."""
+    carry = mask
+    for i, plane in enumerate(counter):
+        if not carry:
+            return
+        counter[i] = plane ^ carry
+        carry &= plane
+    if carry:
+        counter.append(carry)
+
+
+def _add_counter_totals(counter: list, starts: dict, nbytes: int, counts: list):
+    """Add the bit-sliced counter's value at each cell in {cell: slot index} to counts[slot index]."""
+    planes = [plane.to_bytes(nbytes, 'little') for plane in counter]
+    for first, index in starts.items():
+        byte, bit = divmod(first, 8)
+        total = 0
+        for weight, plane in enumerate(planes):
+            total |= ((plane[byte] >> bit) & 1) << weight
+        counts[index] += total
+
+
+def _iter_bits(mask: int):
+    """Yield the positions of the set bits in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class AvailabilityGrid:
+    """
+    Rasterized availability for many people over a fixed-resolution time grid.
+
+    Each person's busy periods are painted once into busy, tentative and OOO
+    bitset planes (Python ints, bit i covers origin + i * resolution epoch
+    minutes).
+    Slot scores then come from shift/OR window reductions over whole planes
+    instead of rescanning every period for every slot.
+    """
+
+    def __init__(self, origin: int, resolution: int, cells: int):
+        self.origin = origin
+        self.resolution = resolution
+        self.cells = cells
+        self.planes = {}
+        self.periods = {}
+        self.exact = set()
+        self._indexes = {}
+
+    @classmethod
+    def for_slots(cls, slots: list) -> 'AvailabilityGrid':
+        """Build an empty grid that covers every slot with cell edges on slot edges."""
+        origin = min(to_minutes(start) for start, _ in slots)
+        origin -= origin % MINUTES_PER_DAY
+        resolution = 0
+        last = 0
+        for start, end in slots:
+            offset = to_minutes(start) - origin
+            length = to_minutes(end) - to_minutes(start)
+            resolution = gcd(resolution, offset, length)
+            last = max(last, offset + length)
+        resolution = resolution or 1
+        return cls(origin, resolution, -(-last // resolution))
+
+    def _cell_range(self, start: int, end: int) -> tuple:
+        """Return the [first, last) cells that epoch minutes [start, end) overlap, clipped to the grid."""
+        first = max((start - self.origin) // self.resolution, 0)
+        last = min(-((self.origin - end) // self.resolution), self.cells)
+        return first, last
+
+    @property
+    def geometry(self) -> tuple:
+        return (self.origin, self.resolution, self.cells)
+
+    def add_person(self, person: str, periods: list):
+        """
+        Paint a person's busy periods (or FreeBusy string) into their status
+        planes, replacing any previous ones.
+        """
+        self.exact.discard(person)
+        self._indexes.pop(person, None)
+        if isinstance(periods, FreeBusy):
+            spans = periods.runs()
+        else:
+            spans = ((status_class(period.status), period.start, period.end) for period in periods)
+        busy = tentative = ooo = 0
+        for status, start, end in spans:
+            if end <= start:
+                # Zero-length or inverted periods don't map onto cells; resolve them exactly
+                self.exact.add(person)
+                continue
+            first, last = self._cell_range(start, end)
+            if first >= last:
+                continue
+            mask = ((1 << (last - first)) - 1) << first
+            if status == 'ooo':
+                ooo |= mask
+            elif status == 'tentative':
+                tentative |= mask
+            else:
+                busy |= mask
+        self.planes[person] = (busy, tentative, ooo)
+        self.periods[person] = periods
+
+    def remove_person(self, person: str):
+        """Drop a person from the grid."""
+        self.planes.pop(person, None)
+        self.periods.pop(person, None)
+        self.exact.discard(person)
+        self._indexes.pop(person, None)
+
+    def exact_status(self, person: str, start: int, end: int) -> str:
+        """is_person_available's status for epoch minutes [start, end), via the person's PeriodIndex."""
+        periods = self.periods[person]
+        if isinstance(periods, FreeBusy):
+            return periods.status(start, end)
+        index = self._indexes.get(person)
+        if index is None:
+            index = self._indexes[person] = PeriodIndex(periods)
+        period = index.first_overlap(start, end)
+        return 'free' if period is None else status_class(period.status)
+
+    def slot_cells(self, slot_start: datetime, slot_end: datetime) -> tuple:
+        """Return (first cell, cell count) for a slot aligned to the grid."""
+        first, last = self._cell_range(to_minutes(slot_start), to_minutes(slot_end))
+        return first, last - first
+
+    def person_statuses(self, person: str, slots: list) -> bytearray:
+        """
+        Status of one person for every slot, as indexes into SLOT_STATUSES.
+        Windows overlapping more than one kind of period fall back to exact_status.
+        """
+        statuses = bytearray(len(slots))
+        if person in self.exact:
+            for index, (slot_start, slot_end) in enumerate(slots):
+                status = self.exact_status(person, to_minutes(slot_start), to_minutes(slot_end))
+                statuses[index] = SLOT_STATUS_INDEX[status]
+            return statuses
+
+        nbytes = (self.cells + 8) // 8
+        busy, tentative, ooo = self.planes[person]
+        windows = {}
+        for index, (slot_start, slot_end) in enumerate(slots):
+            first, width = self.slot_cells(slot_start, slot_end)
+            if width not in windows:
+                windows[width] = [_window_any(plane, width).to_bytes(nbytes, 'little')
+                                  for plane in (tentative, busy, ooo)]
+            byte, bit = divmod(first, 8)
+            hits = [plane[byte] >> bit & 1 for plane in windows[width]]
+            count = sum(hits)
+            if count == 0:
+                statuses[index] = FREE
+            elif count == 1:
+                statuses[index] = hits.index(1) + TENTATIVE
+            else:
+                status = self.exact_status(person, to_minutes(slot_start), to_minutes(slot_end))
+                statuses[index] = SLOT_STATUS_INDEX[status]
+        return statuses
+
+    def _group_slots(self, slots: list) -> tuple:
+        """
+        Group slots by width so each group shares one window reduction.
+
+        Returns (bounds, groups): the epoch-minute (start, end) of every slot,
+        and for each width in cells a ({first cell: slot index}, start_mask)
+        pair whose mask has a bit set at every first cell.
+        """
+        starts_by_width = defaultdict(dict)
+        bounds = []
+        for index, (slot_start, slot_end) in enumerate(slots):
+            start, end = to_minutes(slot_start), to_minutes(slot_end)
+            bounds.append((start, end))
+            first, last = self._cell_range(start, end)
+            starts_by_width[last - first][first] = index
+
+        groups = {}
+        for width, starts in starts_by_width.items():
+            start_mask = 0
+            for first in starts:
+                start_mask |= 1 << first
+            groups[width] = (starts, start_mask)
+        return bounds, groups
+
+    def score_slots(self, slots: list) -> list:
+        """
+        Compute available_count for every slot, identical to analyze_slot.
+
+        A person whose window overlaps only tentative periods counts as 0.5 and
+        one with no overlap counts as 1. Windows that overlap both tentative and
+        hard-busy periods depend on period order, so those are resolved with
+        exact_status.
+        """
+        bounds, groups = self._group_slots(slots)
+
+        free_counts = [0] * len(slots)
+        tentative_counts = [0] * len(slots)
+        nbytes = (self.cells + 8) // 8
+
+        for width, (starts, start_mask) in groups.items():
+            free_counter = []
+            tentative_counter = []
+            for person, (busy, tentative, ooo) in self.planes.items():
+                if person in self.exact:
+                    for first, index in starts.items():
+                        status = self.exact_status(person, *bounds[index])
+                        if status == 'free':
+                            free_counts[index] += 1
+                        elif status == 'tentative':
+                            tentative_counts[index] += 1
+                    continue
+
+                hard = _window_any(busy | ooo, width)
+                soft = _window_any(tentative, width)
+                _add_to_counter(free_counter, start_mask & ~(hard | soft))
+                _add_to_counter(tentative_counter, start_mask & soft & ~hard)
+
+                for first in _iter_bits(start_mask & soft & hard):
+                    index = starts[first]
+                    if self.exact_status(person, *bounds[index]) == 'tentative':
+                        tentative_counts[index] += 1
+
+            _add_counter_totals(free_counter, starts, nbytes, free_counts)
+            _add_counter_totals(tentative_counter, starts, nbytes, tentative_counts)
+
+        return [free + tentative * 0.5 for free, tentative in zip(free_counts, tentative_counts)]
+
+    def recurring_scores(self, slots: list, weeks: int) -> tuple:
+        """
+        Score the first week's slots as weekly meetings repeated for weeks weeks.
+
+        The same window k weeks later sits k * cells-per-week cells further
+        along, so each week is a shift of one window reduction per person over
+        the whole range. Returns (scores, every_week) per slot: available_count
+        summed over the weeks, and how many people are free or tentative in
+        every one of them (the AND of the weekly availability masks).
+        """
+        bounds, groups = self._group_slots(slots)
+
+        week_cells = MINUTES_PER_WEEK // self.resolution
+        free_counts = [0] * len(slots)
+        tentative_counts = [0] * len(slots)
+        every_week = [0] * len(slots)
+        nbytes = (self.cells + 8) // 8
+
+        for width, (starts, start_mask) in groups.items():
+            free_counter = []
+            tentative_counter = []
+            every_counter = []
+            for person, (busy, tentative, ooo) in self.planes.items():
+                exact = person in self.exact
+                if not exact:
+                    hard = _window_any(busy | ooo, width)
+                    soft = _window_any(tentative, width)
+
+                every = start_mask
+                for week in range(weeks):
+                    offset = week * MINUTES_PER_WEEK
+                    if exact:
+                        free = weekly_tentative = 0
+                        for first, index in starts.items():
+                            start, end = bounds[index]
+                            status = self.exact_status(person, start + offset, end + offset)
+                            if status == 'free':
+                                free |= 1 << first
+                            elif status == 'tentative':
+                                weekly_tentative |= 1 << first
+                    else:
+                        week_hard = (hard >> week * week_cells) & start_mask
+                        week_soft = (soft >> week * week_cells) & start_mask
+                        free = start_mask & ~(week_hard | week_soft)
+                        weekly_tentative = week_soft & ~week_hard
+                        for first in _iter_bits(week_soft & week_hard):
+                            start, end = bounds[starts[first]]
+                            if self.exact_status(person, start + offset, end + offset) == 'tentative':
+                                weekly_tentative |= 1 << first
+                    _add_to_counter(free_counter, free)
+                    _add_to_counter(tentative_counter, weekly_tentative)
+                    every &= free | weekly_tentative
+                _add_to_counter(every_counter, every)
+
+            _add_counter_totals(free_counter, starts, nbytes, free_counts)
+            _add_counter_totals(tentative_counter, starts, nbytes, tentative_counts)
+            _add_counter_totals(every_counter, starts, nbytes, every_week)
+
+        scores = [free + tentative * 0.5 for free, tentative in zip(free_counts, tentative_counts)]
+        return scores, every_week
+
+    def any_free(self, slots: list) -> list:
+        """For every slot, whether at least one person (e.g. room) has nothing overlapping it."""
+        bounds, groups = self._group_slots(slots)
+
+        result = [False] * len(slots)
+        for width, (starts, start_mask) in groups.items():
+            # Only the overlap matters here, not which status wins, so one plane per person suffices
+            free = 0
+            for person, (busy, tentative, ooo) in self.planes.items():
+                if person in self.exact:
+                    continue
+                free |= start_mask & ~_window_any(busy | tentative | ooo, width)
+                if free == start_mask:
+                    break
+            for first in _iter_bits(free):
+                result[starts[first]] = True
+
+            if self.exact:
+                for index in starts.values():
+                    if not result[index]:
+                        result[index] = any(self.exact_status(person, *bounds[index]) == 'free'
+                                            for person in self.exact)
+        return result
+
+    def free_people(self, slot_start: datetime, slot_end: datetime) -> list:
+        """People (e.g. rooms) with nothing overlapping a slot, in the order they were added."""
+        return [person for person, periods in self.periods.items()
+                if is_person_available(periods, slot_start, slot_end)[0] == 'free']
+
+
 def generate_time_slots(start_date: str, end_date: str, duration_minutes: int,
-                        work_start: int = 9, work_end: int = 17) -> list:
-    """Generate possible meeting slots within work hours."""
+                        work_start: int = 9, work_end: int = 17, step_minutes: int = 30) -> list:
+    """Generate possible meeting slots within work hours, starting every step_minutes."""
     start = datetime.strptime(start_date, "%m%d%Y")
     end = datetime.strptime(end_date, "%m%d%Y")
     slots = []
@@ -85,8 +846,8 @@ def generate_time_slots(start_date: str, end_date: str, duration_minutes: int,
             slot_end = current + timedelta(minutes=duration_minutes)
             if slot_end.hour < work_end or (slot_end.hour == work_end and slot_end.minute == 0):
                 slots.append((current, slot_end))
-            # Move to next slot (30-minute increments)
-            current += timedelta(minutes=30)
+            # Move to next slot
+            current += timedelta(minutes=step_minutes)
             # Check if we've gone past work hours
             if current.hour >= work_end:
                 # Move to next day
@@ -99,6 +860,31 @@ def generate_time_slots(start_date: str, end_date: str, duration_minutes: int,
     return slots
 
 
+def slot_options_error(durations: list, step: int, work_start: int, work_end: int) -> Optional[str]:
+    """Describe what is wrong with slot-generation options, or None if they are valid."""
+    if step < MIN_STEP_MINUTES:
+        return f'step must be at least {MIN_STEP_MINUTES} minutes'
+    if any(duration <= 0 for duration in durations):
+        return 'durations must be positive'
+    if not 0 <= work_start < work_end <= 23:
+        return 'work hours must satisfy 0 <= work_start < work_end <= 23'
+    return None
+
+
+def find_my_conflicts(my_busy_periods: list, slot_start: datetime, slot_end: datetime) -> list:
+    """List my own events that overlap a time slot."""
+    start = to_minutes(slot_start)
+    end = to_minutes(slot_end)
+    conflicts = []
+    for period in my_busy_periods:
+        if period.start < end and period.end > start:
+            conflicts.append({
+                'subject': period_subject(period),
+                'status': period.status_name
+            })
+    return conflicts
+
+
 def analyze_slot(slot_start: datetime, slot_end: datetime,
                  people_busy_periods: dict, my_busy_periods: list = None) -> dict:
     """Analyze a time slot for all people."""
@@ -117,20 +903,15 @@ def analyze_slot(slot_start: datetime, slot_end: datetime,
         if status == 'free':
             result['free'].append(person)
         elif status == 'tentative':
-            result['tentative'].append({'name': person, 'event': conflict.get('subject') if conflict else None})
+            result['tentative'].append({'name': person, 'event': period_subject(conflict) if conflict else None})
         elif status == 'ooo':
             result['ooo'].append(person)
         else:
-            result['busy'].append({'name': person, 'event': conflict.get('subject') if conflict else None})
+            result['busy'].append({'name': person, 'event': period_subject(conflict) if conflict else None})
 
     # Check my calendar
     if my_busy_periods:
-        for period in my_busy_periods:
-            if period['start'] < slot_end and period['end'] > slot_start:
-                result['my_conflicts'].append({
-                    'subject': period.get('subject', 'Busy'),
-                    'status': period.get('status', 'Busy')
-                })
+        result['my_conflicts'] = find_my_conflicts(my_busy_periods, slot_start, slot_end)
 
     # Score: prioritize free, then tentative (tentative counts as 0.5)
     result['available_count'] = len(result['free']) + len(result['tentative']) * 0.5
@@ -139,6 +920,535 @@ def analyze_slot(slot_start: datetime, slot_end: datetime,
     return result
 
 
+def score_slots(slots: list, people_busy_periods: dict, grid: AvailabilityGrid = None) -> list:
+    """
+    Compute only available_count for every slot, using the availability grid.
+    A prebuilt grid for these slots and people can be passed in.
+    """
+    if not slots:
+        return []
+    if grid is None:
+        grid = AvailabilityGrid.for_slots(slots)
+        for person, periods in people_busy_periods.items():
+            grid.add_person(person, periods)
+    return grid.score_slots(slots)
+
+
+def find_top_slots(slots: list, people_busy_periods: dict, my_busy_periods: list = None,
+                   top: int = 5, grid: AvailabilityGrid = None, profiler: PhaseProfiler = DISABLED,
+                   room_grid: AvailabilityGrid = None) -> list:
+    """
+    Find the best slots in two phases.
+
+    The first pass computes just available_count per slot and keeps the best
+    `top` with a bounded heap; the full analyze_slot breakdown (attendee lists,
+    conflict subjects, my_conflicts) is built only for those winners.
+
+    With a room_grid (rooms painted like people), only slots where at least
+    one room is free are considered, and each result lists those rooms.
+    """
+    with profiler.phase("score_slots", len(slots)):
+        scores = score_slots(slots, people_busy_periods, grid)
+
+    candidates = range(len(slots))
+    if room_grid is not None:
+        with profiler.phase("room_availability", len(slots)):
+            has_room = room_grid.any_free(slots) if slots else []
+            candidates = [i for i in candidates if has_room[i]]
+
+    # Highest availability first, then earliest start
+    with profiler.phase("sort"):
+        winners = heapq.nsmallest(top, candidates, key=lambda i: (-scores[i], slots[i][0]))
+
+    with profiler.phase("analyze_slot", len(winners)):
+        results = [analyze_slot(*slots[i], people_busy_periods, my_busy_periods) for i in winners]
+        if room_grid is not None:
+            for result in results:
+                result['rooms'] = room_grid.free_people(result['start'], result['end'])
+        return results
+
+
+def find_top_slots_by_duration(slots_by_duration: dict, people_busy_periods: dict,
+                               my_busy_periods: list = None, top: int = 5,
+                               profiler: PhaseProfiler = DISABLED, rooms: dict = None) -> dict:
+    """
+    Find the best `top` slots for each duration in {duration: slots}.
+
+    Everyone is painted once into a single grid fine enough for every
+    duration and start step. Each duration then costs one window reduction
+    per person over the whole range, however fine the step. rooms, if given,
+    are painted into a second grid and each slot must have one of them free.
+    """
+    all_slots = [slot for slots in slots_by_duration.values() for slot in slots]
+    grid = room_grid = None
+    if all_slots:
+        with profiler.phase("paint_grid", len(people_busy_periods)):
+            grid = AvailabilityGrid.for_slots(all_slots)
+            for person, periods in people_busy_periods.items():
+                grid.add_person(person, periods)
+        if rooms is not None:
+            with profiler.phase("paint_rooms", len(rooms)):
+                room_grid = AvailabilityGrid(*grid.geometry)
+                for room, periods in rooms.items():
+                    room_grid.add_person(room, periods)
+    return {
+        duration: find_top_slots(slots, people_busy_periods, my_busy_periods, top, grid, profiler, room_grid)
+        for duration, slots in slots_by_duration.items()
+    }
+
+
+def analyze_recurring_slot(slot_start: datetime, slot_end: datetime, weeks: int,
+                           people_busy_periods: dict, my_busy_periods: list = None) -> dict:
+    """Analyze a slot repeated weekly for weeks weeks, summing analyze_slot over the occurrences."""
+    occurrences = [analyze_slot(slot_start + timedelta(weeks=week), slot_end + timedelta(weeks=week),
+                                people_busy_periods, my_busy_periods)
+                   for week in range(weeks)]
+    available_weeks = dict.fromkeys(people_busy_periods, 0)
+    for occurrence in occurrences:
+        for person in occurrence['free']:
+            available_weeks[person] += 1
+        for tentative in occurrence['tentative']:
+            available_weeks[tentative['name']] += 1
+
+    return {
+        'start': slot_start,
+        'end': slot_end,
+        'weeks': weeks,
+        'available_count': sum(occurrence['available_count'] for occurrence in occurrences),
+        'total_people': len(people_busy_periods),
+        'every_week': [person for person, count in available_weeks.items() if count == weeks],
+        'some_weeks': [{'name': person, 'weeks': count}
+                       for person, count in available_weeks.items() if 0 < count < weeks],
+        'no_weeks': [person for person, count in available_weeks.items() if count == 0],
+        'weeks_all_available': sum(1 for occurrence in occurrences
+                                   if not occurrence['busy'] and not occurrence['ooo']),
+        'my_conflicts': [{'start': occurrence['start'], 'conflicts': occurrence['my_conflicts']}
+                         for occurrence in occurrences if occurrence['my_conflicts']],
+    }
+
+
+def find_recurring_slots(slots_by_duration: dict, weeks: int, people_busy_periods: dict,
+                         my_busy_periods: list = None, top: int = 5,
+                         profiler: PhaseProfiler = DISABLED) -> dict:
+    """
+    Find the best weekly recurring slots for each duration in {duration: first-week slots}.
+
+    Every occurrence over the weeks is painted into one grid and scored with
+    AvailabilityGrid.recurring_scores. Slots are ranked by how many people
+    can make every week, then by available_count summed over the weeks, and
+    only the winners get the per-week analyze_slot breakdown.
+    """
+    occurrences = [(start + timedelta(weeks=week), end + timedelta(weeks=week))
+                   for slots in slots_by_duration.values() for start, end in slots for week in range(weeks)]
+    grid = None
+    if occurrences:
+        with profiler.phase("paint_grid", len(people_busy_periods)):
+            grid = AvailabilityGrid.for_slots(occurrences)
+            for person, periods in people_busy_periods.items():
+                grid.add_person(person, periods)
+
+    results = {}
+    for duration, slots in slots_by_duration.items():
+        scores, every_week = [], []
+        if slots:
+            with profiler.phase("recurring_scores", len(slots) * weeks):
+                scores, every_week = grid.recurring_scores(slots, weeks)
+        with profiler.phase("sort"):
+            winners = heapq.nsmallest(top, range(len(slots)),
+                                      key=lambda i: (-every_week[i], -scores[i], slots[i][0]))
+        with profiler.phase("analyze_slot", len(winners) * weeks):
+            results[duration] = [analyze_recurring_slot(*slots[i], weeks, people_busy_periods, my_busy_periods)
+                                 for i in winners]
+    return results
+
+
+class SlotBoard:
+    """
+    Incrementally maintained availability for a fixed list of slots.
+
+    Keeps each person's status per slot and per-slot free/tentative/busy/ooo
+    counts. When a person's events change, only the slots overlapping the
+    changed events are re-evaluated for that person, each with a lookup in
+    their PeriodIndex (which is updated in place rather than rebuilt), and
+    the top-N ranking is kept in a lazily invalidated heap, so an update
+    costs time proportional to the change rather than attendees x slots or
+    the length of the person's calendar.
+    """
+
+    REBUILD_FACTOR = 4
+
+    def __init__(self, slots: list, people_busy_periods: dict):
+        self.slots = slots
+        self.slot_starts = [to_minutes(start) for start, _ in slots]
+        self.slot_ends = [to_minutes(end) for _, end in slots]
+        self.order = sorted(range(len(slots)), key=self.slot_starts.__getitem__)
+        self.sorted_starts = [self.slot_starts[i] for i in self.order]
+        self.max_length = max((end - start for start, end in zip(self.slot_starts, self.slot_ends)), default=0)
+
+        self.counts = [[0] * len(slots) for _ in SLOT_STATUSES]
+        self.statuses = {}
+        self.versions = [0] * len(slots)
+        # PeriodIndex per person, built on first use and kept in step by update_person
+        self._indexes = {}
+
+        if slots:
+            grid = AvailabilityGrid.for_slots(slots)
+            for person, periods in people_busy_periods.items():
+                grid.add_person(person, periods)
+                statuses = self.statuses[person] = grid.person_statuses(person, slots)
+                for index, status in enumerate(statuses):
+                    self.counts[status][index] += 1
+        self._rebuild_heap()
+
+    @property
+    def total_people(self) -> int:
+        return len(self.statuses)
+
+    def score(self, index: int) -> float:
+        """available_count of a slot: free people plus half the tentative ones."""
+        return self.counts[FREE][index] + self.counts[TENTATIVE][index] * 0.5
+
+    def _entry(self, index: int) -> tuple:
+        return (-self.score(index), self.slot_starts[index], index, self.versions[index])
+
+    def _rebuild_heap(self):
+        self._heap = [self._entry(index) for index in range(len(self.slots))]
+        heapq.heapify(self._heap)
+
+    def _set_status(self, person: str, index: int, status: int):
+        statuses = self.statuses[person]
+        old = statuses[index]
+        if old == status:
+            return
+        statuses[index] = status
+        self.counts[old][index] -= 1
+        self.counts[status][index] += 1
+        self.versions[index] += 1
+        heapq.heappush(self._heap, self._entry(index))
+
+    def _slot_status(self, person: str, periods: list, index: int) -> str:
+        """is_person_available's status for one slot, via the person's PeriodIndex."""
+        start, end = self.slot_starts[index], self.slot_ends[index]
+        if isinstance(periods, FreeBusy):
+            return periods.status(start, end)
+        period_index = self._indexes.get(person)
+        if period_index is None:
+            period_index = self._indexes[person] = PeriodIndex(periods)
+        period = period_index.first_overlap(start, end)
+        return 'free' if period is None else status_class(period.status)
+
+    def slots_overlapping(self, start: int, end: int) -> list:
+        """Indexes of slots overlapping epoch minutes [start, end)."""
+        lo = bisect.bisect_left(self.sorted_starts, start - self.max_length + 1)
+        hi = bisect.bisect_left(self.sorted_starts, end)
+        return [i for i in self.order[lo:hi] if self.slot_ends[i] > start]
+
+    def update_person(self, person: str, periods: list, removed: list = None, added: list = None) -> int:
+        """
+        Apply a change to one person's calendar.
+
+        periods is the person's full new list of busy periods: the previous
+        list without the removed periods, with the added ones appended. With
+        neither given, every slot is re-evaluated. Returns the number of
+        slots re-evaluated.
+        """
+        if person not in self.statuses:
+            self.statuses[person] = bytearray(len(self.slots))
+            for index in range(len(self.slots)):
+                self.counts[FREE][index] += 1
+                self.versions[index] += 1
+                heapq.heappush(self._heap, self._entry(index))
+
+        if removed is None and added is None:
+            self._indexes.pop(person, None)
+            affected = range(len(self.slots))
+        else:
+            changed = (removed or []) + (added or [])
+            period_index = self._indexes.get(person)
+            if period_index is not None and len(changed) >= len(periods):
+                # Rebuilding (on next use) is cheaper than editing most of the index
+                del self._indexes[person]
+            elif period_index is not None:
+                for period in removed or []:
+                    period_index.remove(period)
+                for period in added or []:
+                    period_index.add(period)
+            affected = set()
+            for period in changed:
+                # Inverted periods can only overlap slots that span both ends
+                affected.update(self.slots_overlapping(min(period.start, period.end),
+                                                       max(period.start, period.end)))
+
+        for index in affected:
+            self._set_status(person, index, SLOT_STATUS_INDEX[self._slot_status(person, periods, index)])
+        self._maybe_rebuild()
+        return len(affected)
+
+    def remove_person(self, person: str):
+        """Drop a person's statuses from the counts."""
+        self._indexes.pop(person, None)
+        statuses = self.statuses.pop(person, None)
+        if statuses is None:
+            return
+        for index, status in enumerate(statuses):
+            self.counts[status][index] -= 1
+            self.versions[index] += 1
+        self._rebuild_heap()
+
+    def _maybe_rebuild(self):
+        if len(self._heap) > self.REBUILD_FACTOR * max(len(self.slots), 16):
+            self._rebuild_heap()
+
+    def top(self, n: int) -> list:
+        """Indexes of the n best slots (highest available_count, then earliest start)."""
+        winners = []
+        kept = []
+        while self._heap and len(winners) < n:
+            entry = heapq.heappop(self._heap)
+            index, version = entry[2], entry[3]
+            # Entries superseded by a later update are dropped as they surface
+            if version != self.versions[index]:
+                continue
+            winners.append(index)
+            kept.append(entry)
+        for entry in kept:
+            heapq.heappush(self._heap, entry)
+        return winners
+
+
+def slot_result_to_json(result: dict) -> dict:
+    """Convert an analyze_slot result to a JSON-serializable dict."""
+    return {
+        'start': result['start'].isoformat(),
+        'end': result['end'].isoformat(),
+        'available_count': result['available_count'],
+        'total_people': result['total_people'],
+        'free': result['free'],
+        'tentative': [t['name'] for t in result['tentative']],
+        'busy': [b['name'] for b in result['busy']],
+        'ooo': result['ooo'],
+        'my_conflicts': result['my_conflicts'],
+        **({'rooms': result['rooms']} if 'rooms' in result else {}),
+    }
+
+
+def recurring_result_to_json(result: dict) -> dict:
+    """Convert an analyze_recurring_slot result to a JSON-serializable dict."""
+    return {
+        'start': result['start'].isoformat(),
+        'end': result['end'].isoformat(),
+        'weeks': result['weeks'],
+        'available_count': result['available_count'],
+        'total_people': result['total_people'],
+        'every_week': result['every_week'],
+        'some_weeks': result['some_weeks'],
+        'no_weeks': result['no_weeks'],
+        'weeks_all_available': result['weeks_all_available'],
+        'my_conflicts': [{'start': c['start'].isoformat(), 'conflicts': c['conflicts']}
+                         for c in result['my_conflicts']],
+    }
+
+
+class RpcError(Exception):
+    """A JSON-RPC error to report back to the client."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class SchedulingService:
+    """
+    Resident scheduling state for --serve.
+
+    Keeps every person's parsed busy periods in memory, plus a SlotBoard for
+    each recent find_slots query shape, so repeat requests skip reloading,
+    re-parsing and re-scoring. Replacing or patching one person's events only
+    re-evaluates the slots those events overlap on each board.
+    """
+
+    MAX_BOARDS = 8
+
+    def __init__(self, people_busy_periods: dict = None, my_busy_periods: list = None,
+                 use_cache: bool = True, cache_dir: str = None, jobs: int = 1):
+        self.people_busy_periods = dict(people_busy_periods or {})
+        self.my_busy_periods = my_busy_periods
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir
+        self.jobs = jobs
+        self._boards = OrderedDict()
+
+    def _board_for(self, key: tuple) -> SlotBoard:
+        """Return the SlotBoard for a (start, end, duration, work_start, work_end, step) query."""
+        board = self._boards.get(key)
+        if board is not None:
+            self._boards.move_to_end(key)
+            return board
+        board = self._boards[key] = SlotBoard(generate_time_slots(*key), self.people_busy_periods)
+        if len(self._boards) > self.MAX_BOARDS:
+            self._boards.popitem(last=False)
+        return board
+
+    def _update_person(self, person: str, periods: Optional[list], removed: list = None, added: list = None):
+        """
+        Replace (or with None, remove) one person's busy periods everywhere.
+        removed and added are the periods taken out of and appended to the
+        previous list; with neither, everything changed.
+        """
+        if periods is None:
+            self.people_busy_periods.pop(person, None)
+        else:
+            self.people_busy_periods[person] = periods
+        for board in self._boards.values():
+            if periods is None:
+                board.remove_person(person)
+            else:
+                board.update_person(person, periods, removed, added)
+
+    def load(self, calendars: str = None, my_calendar: str = None, free_busy: str = None) -> dict:
+        """Load calendar files, replacing the current state."""
+        if calendars or free_busy:
+            people = {}
+            if calendars:
+                people = load_people_busy_periods(calendars, self.use_cache, self.cache_dir, self.jobs)
+            if free_busy:
+                people.update(load_free_busy(free_busy))
+            self.people_busy_periods = people
+            self._boards.clear()
+        if my_calendar:
+            self.my_busy_periods = load_my_busy_periods(my_calendar, self.use_cache, self.cache_dir)
+        return self.status()
+
+    def status(self) -> dict:
+        return {
+            'people': len(self.people_busy_periods),
+            'has_my_calendar': self.my_busy_periods is not None,
+            'cached_boards': len(self._boards),
+        }
+
+    def find_slots(self, start: str, end: str, duration: int = 60, top: int = 5,
+                   work_start: int = 9, work_end: int = 17, step: int = 30) -> list:
+        """Return the top slots in the same shape as --json output."""
+        error = slot_options_error([duration], step, work_start, work_end)
+        if error:
+            raise ValueError(error)
+        board = self._board_for((start, end, duration, work_start, work_end, step))
+        results = [analyze_slot(*board.slots[i], self.people_busy_periods, self.my_busy_periods)
+                   for i in board.top(top)]
+        return [slot_result_to_json(r) for r in results]
+
+    def set_person(self, name: str, events: list) -> dict:
+        """Replace one person's calendar with a new list of raw events."""
+        old = self.people_busy_periods.get(name)
+        periods = get_busy_periods(events)
+        if old is None or isinstance(old, FreeBusy):
+            self._update_person(name, periods)
+        else:
+            self._update_person(name, periods, old, periods)
+        return {'name': name, 'periods': len(periods)}
+
+    def set_free_busy(self, name: str, free_busy: str, start_date: str, minutes_per_char: int = 30) -> dict:
+        """Replace one person's calendar with an Outlook free/busy digit string."""
+        start = parse_minutes(start_date, EVENT_FORMATS)
+        if start is None:
+            raise ValueError(f'Invalid start_date: {start_date!r}')
+        self._update_person(name, FreeBusy(start, minutes_per_char, free_busy))
+        return {'name': name, 'chars': len(free_busy)}
+
+    def patch_person(self, name: str, add: list = None, remove: list = None) -> dict:
+        """
+        Add and remove events for one person. Each entry of remove is a dict of
+        raw event fields (e.g. {"id": ..., "start": ...}); periods whose fields
+        all match are dropped.
+        """
+        old = self.people_busy_periods.get(name)
+        if isinstance(old, FreeBusy):
+            raise ValueError(f'{name} has free/busy data, not events; use set_person')
+        periods = []
+        removed = []
+        for period in old or []:
+            if remove and any(all(period.get(k) == v for k, v in match.items()) for match in remove):
+                removed.append(period)
+            else:
+                periods.append(period)
+        added = get_busy_periods(add or [])
+        periods.extend(added)
+        if old is None:
+            self._update_person(name, periods)
+        else:
+            self._update_person(name, periods, removed, added)
+        return {'name': name, 'periods': len(periods), 'removed': len(removed), 'added': len(added)}
+
+    def remove_person(self, name: str) -> dict:
+        """Drop a person from the attendee set."""
+        self._update_person(name, None)
+        return self.status()
+
+    def set_my_calendar(self, events: list = None) -> dict:
+        """Replace (or with null, clear) my own calendar."""
+        self.my_busy_periods = get_busy_periods(events) if events is not None else None
+        return self.status()
+
+    METHODS = ('load', 'status', 'find_slots', 'set_person', 'set_free_busy', 'patch_person',
+               'remove_person', 'set_my_calendar')
+
+    def dispatch(self, method: str, params) -> object:
+        """Call a service method with JSON-RPC params (object or array)."""
+        if method not in self.METHODS:
+            raise RpcError(-32601, f"Method not found: {method}")
+        handler = getattr(self, method)
+        try:
+            if isinstance(params, dict):
+                bound = inspect.signature(handler).bind(**params)
+            else:
+                bound = inspect.signature(handler).bind(*(params or []))
+        except TypeError as e:
+            raise RpcError(-32602, f"Invalid params: {e}")
+        return handler(*bound.args, **bound.kwargs)
+
+
+def serve(service: SchedulingService, instream=None, outstream=None):
+    """
+    Answer newline-delimited JSON-RPC 2.0 requests until EOF or a "shutdown" call.
+    """
+    instream = instream or sys.stdin
+    outstream = outstream or sys.stdout
+
+    for line in instream:
+        line = line.strip()
+        if not line:
+            continue
+        request = None
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise RpcError(-32700, f"Parse error: {e}")
+            if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+                raise RpcError(-32600, "Invalid request")
+            request_id = request.get('id')
+            if request['method'] == 'shutdown':
+                result = None
+            else:
+                result = service.dispatch(request['method'], request.get('params'))
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except RpcError as e:
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': e.code, 'message': e.message}}
+        except Exception as e:
+            # Keep serving after a failed request
+            response = {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32000, 'message': str(e)}}
+
+        # Requests without an id are notifications and get no response unless they fail
+        is_request = isinstance(request, dict)
+        if not is_request or 'id' in request or 'error' in response:
+            outstream.write(json.dumps(response) + '\n')
+            outstream.flush()
+        if is_request and request.get('method') == 'shutdown':
+            return
+
+
 def format_slot_result(result: dict, show_my_calendar: bool = True) -> str:
     """Format a single slot result for display."""
     lines = []
@@ -153,7 +1463,9 @@ def format_slot_result(result: dict, show_my_calendar: bool = True) -> str:
         lines.append(f"  Free: {', '.join(result['free'])}")
 
     if result['tentative']:
-        tentative_str = ', '.join([f"{t['name']} ({t['event']})" for t in result['tentative']])
+        # Free/busy attendees have no event to show
+        tentative_str = ', '.join([f"{t['name']} ({t['event']})" if t['event'] is not None else t['name']
+                                   for t in result['tentative']])
         lines.append(f"  Tentative: {tentative_str}")
 
     if result['busy']:
@@ -167,81 +1479,203 @@ def format_slot_result(result: dict, show_my_calendar: bool = True) -> str:
         conflicts = ', '.join([f"{c['subject']} [{c['status']}]" for c in result['my_conflicts']])
         lines.append(f"  Your conflicts: {conflicts}")
 
+    if result.get('rooms'):
+        lines.append(f"  Rooms: {', '.join(result['rooms'])}")
+
+    return '\n'.join(lines)
+
+
+def format_recurring_result(result: dict, show_my_calendar: bool = True) -> str:
+    """Format a single recurring slot result for display."""
+    lines = []
+    day = result['start'].strftime("%A")
+    start = result['start'].strftime("%I:%M %p")
+    end = result['end'].strftime("%I:%M %p")
+    weeks = result['weeks']
+    every_week = len(result['every_week'])
+    total = result['total_people']
+
+    lines.append(f"**{day}s {start} - {end}** from {result['start'].strftime('%m/%d')} "
+                 f"({every_week}/{total} every week, {result['available_count']:g}/{total * weeks} person-weeks)")
+
+    if result['every_week']:
+        lines.append(f"  Every week: {', '.join(result['every_week'])}")
+
+    if result['some_weeks']:
+        some_str = ', '.join([f"{s['name']} ({s['weeks']}/{weeks})" for s in result['some_weeks']])
+        lines.append(f"  Some weeks: {some_str}")
+
+    if result['no_weeks']:
+        lines.append(f"  No weeks: {', '.join(result['no_weeks'])}")
+
+    lines.append(f"  Everyone available: {result['weeks_all_available']}/{weeks} weeks")
+
+    if show_my_calendar and result['my_conflicts']:
+        conflicts = ', '.join([f"{c['start'].strftime('%m/%d')} ({', '.join(x['subject'] for x in c['conflicts'])})"
+                               for c in result['my_conflicts']])
+        lines.append(f"  Your conflicts: {conflicts}")
+
     return '\n'.join(lines)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Find optimal meeting times')
-    parser.add_argument('calendars_json', help='JSON file with all calendars')
+    parser.add_argument('calendars_json', nargs='?', help='JSON file with all calendars')
     parser.add_argument('--duration', type=int, default=60, help='Meeting duration in minutes')
+    parser.add_argument('--durations', type=int, nargs='+', metavar='MINUTES',
+                        help='Compare several meeting durations in one run (top N for each)')
+    parser.add_argument('--step', type=int, default=30,
+                        help=f'Minutes between candidate start times (at least {MIN_STEP_MINUTES})')
     parser.add_argument('--top', type=int, default=5, help='Number of top slots to show')
-    parser.add_argument('--start', required=True, help='Start date (MMDDYYYY)')
-    parser.add_argument('--end', required=True, help='End date (MMDDYYYY)')
+    parser.add_argument('--start', help='Start date (MMDDYYYY)')
+    parser.add_argument('--end', help='End date (MMDDYYYY)')
+    parser.add_argument('--recurring', choices=['weekly'],
+                        help='Find a slot that repeats every week from --start (use with --weeks instead of --end)')
+    parser.add_argument('--weeks', type=int, help='Number of weeks for --recurring')
     parser.add_argument('--my-calendar', help='Your calendar JSON file')
+    parser.add_argument('--rooms', metavar='FILE',
+                        help='Room calendars JSON; only slots with a free room are returned')
+    parser.add_argument('--building', help='With --rooms, only use rooms in this building')
+    parser.add_argument('--floor', type=int, help='With --rooms, only use rooms on this floor')
+    parser.add_argument('--capacity', type=int, help='With --rooms, only use rooms seating at least this many')
+    parser.add_argument('--free-busy', metavar='FILE',
+                        help='JSON file of attendees\' Outlook free/busy digit strings')
     parser.add_argument('--work-start', type=int, default=9, help='Work day start hour (0-23)')
     parser.add_argument('--work-end', type=int, default=17, help='Work day end hour (0-23)')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse calendar files, bypassing the cache')
+    parser.add_argument('--cache-dir', help='Directory for parsed-calendar cache files')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Parse uncached calendars in this many forked worker processes '
+                             '(no effect where fork is unavailable, e.g. Windows)')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as a resident JSON-RPC service on stdin/stdout')
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
+    if args.recurring:
+        if args.serve or args.rooms:
+            parser.error('--recurring is not supported with --serve or --rooms')
+        if args.end:
+            parser.error('--recurring takes --weeks instead of --end')
+        if args.weeks is None or args.weeks < 1:
+            parser.error('--recurring requires --weeks N (at least 1)')
+        if not args.start:
+            parser.error('--recurring requires --start')
+        try:
+            # The first week's slots are generated and repeated weekly
+            first_week_end = datetime.strptime(args.start, '%m%d%Y') + timedelta(days=6)
+        except ValueError as e:
+            parser.error(str(e))
+        args.end = first_week_end.strftime('%m%d%Y')
+    elif args.weeks is not None:
+        parser.error('--weeks requires --recurring weekly')
+    if not args.serve and (not (args.calendars_json or args.free_busy) or not args.start or not args.end):
+        parser.error('calendars_json or --free-busy, --start and --end are required')
+    if (args.building is not None or args.floor is not None or args.capacity is not None) and not args.rooms:
+        parser.error('--building, --floor and --capacity require --rooms')
+    if args.rooms and args.serve:
+        parser.error('--rooms is not supported with --serve')
+    error = slot_options_error(args.durations or [args.duration], args.step, args.work_start, args.work_end)
+    if error:
+        parser.error(error)
 
-    # Load calendars
-    with open(args.calendars_json, 'r', encoding='utf-8') as f:
-        calendars = json.load(f)
+    profiler = profiler_from_args(args)
+    try:
+        run(args, profiler)
+    finally:
+        finish_profile(profiler, args)
 
-    # Extract busy periods for each person
+
+def run(args: argparse.Namespace, profiler: PhaseProfiler):
+    """Serve, or find and print the top slots for the parsed command line."""
+    use_cache = not args.no_cache
+
+    if args.serve:
+        service = SchedulingService(use_cache=use_cache, cache_dir=args.cache_dir, jobs=args.jobs)
+        with profiler.phase('load'):
+            service.load(args.calendars_json, args.my_calendar, args.free_busy)
+        with profiler.phase('serve'):
+            serve(service)
+        return
+
+    # Load calendars and extract busy periods for each person
     people_busy_periods = {}
-    for person, events in calendars.items():
-        people_busy_periods[person] = get_busy_periods(events)
+    if args.calendars_json:
+        with profiler.phase('get_busy_periods') as phase:
+            people_busy_periods = load_people_busy_periods(args.calendars_json, use_cache, args.cache_dir,
+                                                           args.jobs)
+            if phase is not None:
+                phase.calls = len(people_busy_periods)
+    if args.free_busy:
+        with profiler.phase('load_free_busy') as phase:
+            free_busy = load_free_busy(args.free_busy)
+            if phase is not None:
+                phase.calls = len(free_busy)
+        people_busy_periods.update(free_busy)
 
     # Load my calendar if provided
     my_busy_periods = None
     if args.my_calendar:
-        with open(args.my_calendar, 'r', encoding='utf-8') as f:
-            my_data = json.load(f)
-            # Handle MCP response format
-            if isinstance(my_data, list) and len(my_data) > 0 and 'text' in my_data[0]:
-                my_events = json.loads(my_data[0]['text'])
-            else:
-                my_events = my_data
-            my_busy_periods = get_busy_periods(my_events)
+        with profiler.phase('load_my_busy_periods'):
+            my_busy_periods = load_my_busy_periods(args.my_calendar, use_cache, args.cache_dir)
+
+    rooms = None
+    if args.rooms:
+        with profiler.phase('load_rooms') as phase:
+            rooms = load_rooms(args.rooms, args.building, args.floor, args.capacity)
+            if phase is not None:
+                phase.calls = len(rooms)
+        if not rooms:
+            print(f"Error: no rooms in {args.rooms} match --building/--floor/--capacity", file=sys.stderr)
+            sys.exit(1)
 
     # Generate time slots
-    slots = generate_time_slots(args.start, args.end, args.duration,
-                                 args.work_start, args.work_end)
+    durations = args.durations or [args.duration]
+    with profiler.phase('generate_time_slots', len(durations)):
+        slots_by_duration = {
+            duration: generate_time_slots(args.start, args.end, duration,
+                                          args.work_start, args.work_end, args.step)
+            for duration in durations
+        }
 
-    # Analyze each slot
-    results = []
-    for slot_start, slot_end in slots:
-        result = analyze_slot(slot_start, slot_end, people_busy_periods, my_busy_periods)
-        results.append(result)
-
-    # Sort by availability (highest first), then by date
-    results.sort(key=lambda r: (-r['available_count'], r['start']))
-
-    # Take top N
-    top_results = results[:args.top]
-
-    if args.json:
-        # Convert to JSON-serializable format
-        json_results = []
-        for r in top_results:
-            json_results.append({
-                'start': r['start'].isoformat(),
-                'end': r['end'].isoformat(),
-                'available_count': r['available_count'],
-                'total_people': r['total_people'],
-                'free': r['free'],
-                'tentative': [t['name'] for t in r['tentative']],
-                'busy': [b['name'] for b in r['busy']],
-                'ooo': r['ooo'],
-                'my_conflicts': r['my_conflicts']
-            })
-        print(json.dumps(json_results, indent=2))
-    else:
-        print(f"\nTop {len(top_results)} meeting slots for {args.duration}-minute meeting:\n")
-        for i, result in enumerate(top_results, 1):
-            print(f"{i}. {format_slot_result(result, my_busy_periods is not None)}")
-            print()
+    if args.recurring:
+        recurring_by_duration = find_recurring_slots(slots_by_duration, args.weeks, people_busy_periods,
+                                                     my_busy_periods, args.top, profiler)
+        with profiler.phase('output'):
+            if args.json:
+                json_results = {str(duration): [recurring_result_to_json(r) for r in results]
+                                for duration, results in recurring_by_duration.items()}
+                if not args.durations:
+                    json_results = json_results[str(args.duration)]
+                print(json.dumps(json_results, indent=2))
+            else:
+                for duration, top_results in recurring_by_duration.items():
+                    print(f"\nTop {len(top_results)} weekly slots for {duration}-minute meeting "
+                          f"over {args.weeks} weeks:\n")
+                    for i, result in enumerate(top_results, 1):
+                        print(f"{i}. {format_recurring_result(result, my_busy_periods is not None)}")
+                        print()
+        return
+
+    # Score every slot, keep the top N and analyze only those in detail
+    results_by_duration = find_top_slots_by_duration(slots_by_duration, people_busy_periods, my_busy_periods,
+                                                     args.top, profiler, rooms)
+
+    with profiler.phase('output'):
+        if args.json:
+            # Convert to JSON-serializable format; --durations keys the lists by duration
+            json_results = {str(duration): [slot_result_to_json(r) for r in results]
+                            for duration, results in results_by_duration.items()}
+            if not args.durations:
+                json_results = json_results[str(args.duration)]
+            print(json.dumps(json_results, indent=2))
+        else:
+            for duration, top_results in results_by_duration.items():
+                print(f"\nTop {len(top_results)} meeting slots for {duration}-minute meeting:\n")
+                for i, result in enumerate(top_results, 1):
+                    print(f"{i}. {format_slot_result(result, my_busy_periods is not None)}")
+                    print()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,215 @@
+"""
+json_stream.py - Incremental JSON reading for large calendar exports.
+
+JsonStreamReader pulls JSON text from an iterator of chunks and lets the
+caller walk arrays and objects one member at a time, decode small values, or
+stream the contents of a large string without holding the whole document in
+memory.
+"""
+
+import json
+import re
+from typing import Any, Iterator
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Run of string content made of plain characters and complete escapes
+_STRING_BODY = re.compile(r'(?:[^"\\\x00-\x1f]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+_HIGH_SURROGATE_TAIL = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_NUMBER_TAIL = re.compile(r"[0-9eE.+-]*")
+# Longest escape that must be seen whole: a \uXXXX\uXXXX surrogate pair
+_MAX_ESCAPE = 12
+
+
+class JsonStreamReader:
+    """
+    Pull-style reader over a stream of JSON text chunks.
+
+    iter_array() and iter_object() yield once per member; the caller must
+    consume exactly one value (read_value, skip_value, iter_string, or a
+    nested iter_array/iter_object) before resuming the iterator.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = iter(chunks)
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        # Absolute offset, line number and line start of _buf[0], for error messages
+        self._offset = 0
+        self._line = 1
+        self._line_start = 0
+
+    @classmethod
+    def from_file(cls, f, chunk_size: int = CHUNK_SIZE) -> "JsonStreamReader":
+        """Read from an open text file in fixed-size chunks."""
+        return cls(iter(lambda: f.read(chunk_size), ""))
+
+    def _fill(self, grow: bool = False) -> bool:
+        """Append more input to the buffer; False once the input is exhausted."""
+        consumed = self._pos
+        newlines = self._buf.count("\n", 0, consumed)
+        if newlines:
+            self._line += newlines
+            self._line_start = self._offset + self._buf.rindex("\n", 0, consumed) + 1
+        self._offset += consumed
+        pending = self._buf[consumed:]
+        added = []
+        size = 0
+        while not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            if not chunk:
+                continue
+            added.append(chunk)
+            size += len(chunk)
+            # Growing geometrically keeps retried decodes of large values linear
+            if not grow or size >= len(pending):
+                break
+        self._buf = pending + "".join(added)
+        self._pos = 0
+        return size > 0
+
+    def _location(self, pos: int) -> tuple:
+        """Return the (offset, line, column) in the whole input of buffer position pos."""
+        newlines = self._buf.count("\n", 0, pos)
+        line_start = self._line_start
+        if newlines:
+            line_start = self._offset + self._buf.rindex("\n", 0, pos) + 1
+        offset = self._offset + pos
+        return offset, self._line + newlines, offset - line_start + 1
+
+    def _error(self, msg: str, pos: int = None, location: tuple = None) -> json.JSONDecodeError:
+        """Build a JSONDecodeError at buffer position pos (or a saved _location), placed in the whole input."""
+        pos = self._pos if pos is None else pos
+        error = json.JSONDecodeError(msg, self._buf, min(pos, len(self._buf)))
+        error.pos, error.lineno, error.colno = location or self._location(pos)
+        error.args = (f"{msg}: line {error.lineno} column {error.colno} (char {error.pos})",)
+        return error
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of input."""
+        if self._pos < len(self._buf) and self._buf[self._pos] not in " \t\n\r":
+            return self._buf[self._pos]
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Refilling moves the buffer, so keep the error position relative to the value
+                distance = e.pos - self._pos
+                if self._fill(grow=True):
+                    continue
+                raise self._error(e.msg, self._pos + distance) from None
+            # A number at the end of the buffer may continue in the next chunk
+            if (isinstance(value, (int, float)) and not self._eof
+                    and _NUMBER_TAIL.match(self._buf, end).end() == len(self._buf)
+                    and self._fill(grow=True)):
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Consume the next JSON value without materializing large containers."""
+        char = self.peek()
+        if char == '"':
+            for _ in self.iter_string():
+                pass
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        elif char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        else:
+            self.read_value()
+
+    def iter_string(self) -> Iterator[str]:
+        """Yield the decoded contents of the next JSON string in pieces."""
+        self._expect('"')
+        start = self._location(self._pos - 1)
+        while True:
+            end = _STRING_BODY.match(self._buf, self._pos).end()
+            closed = end < len(self._buf) and self._buf[end] == '"'
+            if not closed and self._ends_with_high_surrogate(end):
+                # Keep a high surrogate together with its low half, which may be cut off mid-escape
+                end -= 6
+            if end > self._pos:
+                try:
+                    piece = json.loads('"' + self._buf[self._pos:end] + '"')
+                except json.JSONDecodeError as e:
+                    raise self._error(e.msg, self._pos + e.pos - 1) from None
+                yield piece
+                self._pos = end
+            if self._pos < len(self._buf) and self._buf[self._pos] == '"':
+                self._pos += 1
+                return
+            if len(self._buf) - self._pos >= _MAX_ESCAPE:
+                raise self._error("Invalid \\escape or control character in string")
+            if not self._fill():
+                raise self._error("Unterminated string starting at", location=start)
+
+    def _ends_with_high_surrogate(self, end: int) -> bool:
+        """Check whether the string content before end finishes with a \\uD800-\\uDBFF escape."""
+        match = _HIGH_SURROGATE_TAIL.search(self._buf, self._pos, end)
+        if not match:
+            return False
+        # The backslash must not itself be escaped
+        start = match.start()
+        while start > self._pos and self._buf[start - 1] == "\\":
+            start -= 1
+        return (match.start() - start) % 2 == 0
+
+    def iter_array(self) -> Iterator[None]:
+        """Walk the next JSON array, yielding once per element."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_object(self) -> Iterator[str]:
+        """Walk the next JSON object, yielding each key before its value."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
@@ -5,15 +5,43 @@ parse_calendar.py - Parse and filter Outlook calendar JSON exports.
 Usage:
     python parse_calendar.py <file> --date MMDDYYYY [--format summary|detailed] [--json]
     python parse_calendar.py <file> --range MMDDYYYY MMDDYYYY [--format summary|detailed] [--json]
+    python parse_calendar.py <file> --range MMDDYYYY MMDDYYYY --stream [--json]
+    python parse_calendar.py <file> <file> ... --range MMDDYYYY MMDDYYYY [--stream] [--json]
+    python parse_calendar.py <file> --batch [--date ...] [--range ...] < queries.ndjson
+
+Batch mode loads the file once and answers many queries, printing one JSON
+result per line. Repeated --date/--range arguments run as a batch too; stdin
+queries look like {"date": "MMDDYYYY"} or {"range": ["MMDDYYYY", "MMDDYYYY"]}
+with optional "format" and "json" keys.
 
 Output format groups events by time of day (Morning/Afternoon/Evening).
+Several files, or one {"Person": [events]} aggregate like the calendars_json
+of find_meeting_times.py, are merged into one agenda: each event is labelled
+with its calendar (file name or person), and a meeting found on several
+calendars is listed once with all of them.
+
+--stream prints each day of the range as its own block (or NDJSON line with
+--json) as soon as that day is complete.
+Parsed events are cached on disk between runs; pass --no-cache to bypass
+the cache or --cache-dir to choose where it lives. --profile reports
+per-phase timings and memory (see profiling.py).
 """
 
 import argparse
+import bisect
+import heapq
+import itertools
 import json
+import os
 import sys
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from calendar_cache import open_cache
+from calendar_model import MINUTES_PER_DAY, OUTLOOK_FORMATS, Event, from_minutes, parse_minutes, to_minutes
+from json_stream import JsonStreamReader
+from profiling import DISABLED, PhaseProfiler, add_profile_arguments, finish_profile, profiler_from_args
 
 
 def parse_date_arg(date_str: str) -> datetime:
@@ -24,17 +52,15 @@ def parse_date_arg(date_str: str) -> datetime:
 def parse_event_datetime(dt_str: str) -> datetime:
     """Parse event datetime string like '2/12/2026 08:00 AM'."""
     # Handle various formats from Outlook
-    for fmt in ["%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M"]:
-        try:
-            return datetime.strptime(dt_str, fmt)
-        except ValueError:
-            continue
-    raise ValueError(f"Cannot parse datetime: {dt_str}")
+    minutes = parse_minutes(dt_str, OUTLOOK_FORMATS)
+    if minutes is None:
+        raise ValueError(f"Cannot parse datetime: {dt_str}")
+    return from_minutes(minutes)
 
 
-def get_time_of_day(dt: datetime) -> str:
-    """Categorize time into Morning/Afternoon/Evening."""
-    hour = dt.hour
+def get_time_of_day(minutes: int) -> str:
+    """Categorize an epoch-minute time into Morning/Afternoon/Evening."""
+    hour = minutes % MINUTES_PER_DAY // 60
     if hour < 12:
         return "Morning"
     elif hour < 17:
@@ -43,9 +69,10 @@ def get_time_of_day(dt: datetime) -> str:
         return "Evening"
 
 
-def format_time(dt: datetime) -> str:
-    """Format datetime to time string like '9:00 AM'."""
-    return dt.strftime("%I:%M %p").lstrip("0")
+def format_time(minutes: int) -> str:
+    """Format an epoch-minute time to a string like '9:00 AM'."""
+    hour, minute = divmod(minutes % MINUTES_PER_DAY, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
 
 
 def get_status_indicator(busy_status: str) -> str:
@@ -60,71 +87,390 @@ def get_status_indicator(busy_status: str) -> str:
     return status_map.get(busy_status, f"[{busy_status}]")
 
 
-def is_all_day_event(event: dict) -> bool:
+def is_all_day_event(event: Event) -> bool:
     """Check if event is an all-day event (starts at midnight, spans full day)."""
-    try:
-        start = parse_event_datetime(event["start"])
-        end = parse_event_datetime(event["end"])
-        return start.hour == 0 and start.minute == 0 and (end - start).days >= 1
-    except (ValueError, KeyError):
+    if event.start is None or event.end is None:
         return False
+    return event.start % MINUTES_PER_DAY == 0 and event.end - event.start >= MINUTES_PER_DAY
 
 
-def event_in_date_range(event: dict, start_date: datetime, end_date: datetime) -> bool:
-    """Check if event falls within date range."""
-    try:
-        event_start = parse_event_datetime(event["start"])
-        event_date = event_start.date()
-        return start_date.date() <= event_date <= end_date.date()
-    except (ValueError, KeyError):
+def event_days(start: int, end: Optional[int]) -> tuple:
+    """Return the (first, last) day numbers an event covers; end is exclusive."""
+    first = start // MINUTES_PER_DAY
+    if end is None or end <= start:
+        return first, first
+    return first, (end - 1) // MINUTES_PER_DAY
+
+
+def event_in_date_range(event: Event, start_date: datetime, end_date: datetime) -> bool:
+    """Check if event covers any day within date range (multi-day events count on every day)."""
+    if event.start is None:
         return False
+    first, last = event_days(event.start, event.end)
+    return first <= to_minutes(end_date) // MINUTES_PER_DAY and last >= to_minutes(start_date) // MINUTES_PER_DAY
+
+
+class DayIndex:
+    """
+    Date index over a list of events for --date/--range lookups.
+
+    Event positions are sorted by start with a per-day offset table into that
+    order, so a query bisects straight to the events starting on the requested
+    days. Events that run past their start day (including multi-day all-day
+    events) are also kept in a small span list so they show up on every day
+    they cover.
+    """
+
+    def __init__(self, events: Sequence[Event]):
+        self.events = events
+        columns = getattr(events, "columns", None)
+        if columns is not None:
+            starts, ends = columns()
+        else:
+            starts = [event.start for event in events]
+            ends = [event.end for event in events]
+
+        # Events whose start didn't parse never match a date filter
+        self.order = sorted((i for i, start in enumerate(starts) if start is not None), key=starts.__getitem__)
+        self.starts = [starts[i] for i in self.order]
+
+        # day_offsets[d - first_day] is the first position in order starting on day d or later
+        self.first_day = self.starts[0] // MINUTES_PER_DAY if self.starts else 0
+        last_day = self.starts[-1] // MINUTES_PER_DAY if self.starts else -1
+        self.day_offsets = [bisect.bisect_left(self.starts, day * MINUTES_PER_DAY)
+                            for day in range(self.first_day, last_day + 2)]
+
+        # (start day, last day, position) for events covering more than one day, by start
+        self.spans = []
+        for position, i in enumerate(self.order):
+            first, last = event_days(starts[i], ends[i])
+            if last > first:
+                self.spans.append((first, last, position))
+
+    def _offset(self, day: int) -> int:
+        """Position in order of the first event starting on or after day."""
+        index = day - self.first_day
+        if index <= 0:
+            return 0
+        if index >= len(self.day_offsets):
+            return len(self.order)
+        return self.day_offsets[index]
+
+    def _positions(self, start_date: datetime, end_date: datetime) -> list:
+        """Positions in order of the events covering any day in [start_date, end_date], ascending."""
+        first_day = to_minutes(start_date) // MINUTES_PER_DAY
+        last_day = to_minutes(end_date) // MINUTES_PER_DAY
+
+        # Events that started earlier but are still running on the first day
+        positions = []
+        for span_first, span_last, position in self.spans:
+            if span_first >= first_day:
+                break
+            if span_last >= first_day:
+                positions.append(position)
+
+        positions.extend(range(self._offset(first_day), self._offset(last_day + 1)))
+        return positions
+
+    def query(self, start_date: datetime, end_date: datetime) -> list[Event]:
+        """Return the events covering any day in [start_date, end_date], in original order."""
+        return [self.events[i] for i in sorted(self.order[p] for p in self._positions(start_date, end_date))]
+
+    def iter_range(self, start_date: datetime, end_date: datetime) -> Iterator[Event]:
+        """Yield the events covering any day in [start_date, end_date] one at a time, by start."""
+        for position in self._positions(start_date, end_date):
+            yield self.events[self.order[position]]
+
+
+def starts_in_day_order(starts: Iterable[Optional[int]]) -> bool:
+    """Whether event starts (None for unparsed) come in non-decreasing day order, as iter_days needs."""
+    last_day = None
+    for start in starts:
+        if start is None:
+            continue
+        day = start // MINUTES_PER_DAY
+        if last_day is not None and day < last_day:
+            return False
+        last_day = day
+    return True
+
+
+def iter_days(events: Iterable[Event], start_date: datetime, end_date: datetime) -> Iterator[tuple]:
+    """
+    Group a stream of events in start-day order into (day, events by start)
+    for each day of [start_date, end_date] they cover.
+
+    A day is yielded as soon as an event starting on a later day arrives, so
+    only the days still open are held in memory. Raises ValueError if an
+    event arrives for a day that was already yielded.
+    """
+    first_day = to_minutes(start_date) // MINUTES_PER_DAY
+    last_day = to_minutes(end_date) // MINUTES_PER_DAY
+    pending = {}
+    open_days = []
+    done_through = first_day - 1
+    for event in events:
+        if event.start is None:
+            continue
+        first, last = event_days(event.start, event.end)
+        if last < first_day or first > last_day:
+            continue
+        if max(first, first_day) <= done_through:
+            raise ValueError("iter_days needs events in start-day order")
+        # Every day before this event's start day is complete
+        while open_days and open_days[0] < first:
+            day = heapq.heappop(open_days)
+            done_through = day
+            yield from_minutes(day * MINUTES_PER_DAY), sorted(pending.pop(day), key=_event_start)
+        for day in range(max(first, first_day), min(last, last_day) + 1):
+            if day not in pending:
+                pending[day] = []
+                heapq.heappush(open_days, day)
+            pending[day].append(event)
+    while open_days:
+        day = heapq.heappop(open_days)
+        yield from_minutes(day * MINUTES_PER_DAY), sorted(pending.pop(day), key=_event_start)
+
+
+def _event_start(event: Event) -> int:
+    return event.start
+
+
+def _iter_text_block_events(chunks: Iterator[str]) -> Iterator[dict]:
+    """Yield events from the {"events": [...]} payload of one MCP text block."""
+    chunks = iter(chunks)
+    try:
+        first = next((chunk for chunk in chunks if chunk), "")
+        # Skip date context messages
+        if not first.startswith("{"):
+            return
+        reader = JsonStreamReader(itertools.chain((first,), chunks))
+        for key in reader.iter_object():
+            if key == "events" and reader.peek() == "[":
+                for _ in reader.iter_array():
+                    yield reader.read_value()
+            else:
+                reader.skip_value()
+    except json.JSONDecodeError:
+        return
+    finally:
+        # Consume the rest of the text so the outer reader can continue
+        for _ in chunks:
+            pass
+
+
+def iter_calendar_events(filepath: str) -> Iterator[dict]:
+    """
+    Stream events from a calendar JSON file one at a time.
+
+    Walks the outer MCP array and the embedded events payload of each text
+    block incrementally, so memory stays flat however large the export is.
+    A malformed payload ends its block; events already yielded from it stand.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        reader = JsonStreamReader.from_file(f)
+
+        # Handle the MCP response format: array with text blocks
+        if reader.peek() != "[":
+            reader.skip_value()
+            return
+
+        for _ in reader.iter_array():
+            if reader.peek() != "{":
+                reader.skip_value()
+                continue
+            item_type = None
+            text = None
+            for key in reader.iter_object():
+                if key == "type":
+                    item_type = reader.read_value()
+                elif key == "text" and reader.peek() == '"':
+                    if item_type == "text":
+                        yield from _iter_text_block_events(reader.iter_string())
+                    else:
+                        # "type" hasn't been seen yet, so hold on to the text
+                        text = reader.read_value()
+                else:
+                    reader.skip_value()
+            if text is not None and item_type == "text":
+                yield from _iter_text_block_events(iter((text,)))
+
+
+def is_aggregate(filepath: str) -> bool:
+    """Whether a file is a {"Person": [events]} aggregate (like find_meeting_times.py's input)."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        return JsonStreamReader.from_file(f).peek() == "{"
+
+
+def _iter_event_array(reader: JsonStreamReader) -> Iterator[dict]:
+    """Yield the events of one person's list in an aggregate file."""
+    if reader.peek() != "[":
+        reader.skip_value()
+        return
+    for _ in reader.iter_array():
+        yield reader.read_value()
+
+
+def iter_calendar_sources(filepath: str) -> Iterator[tuple]:
+    """
+    Stream (label, events) for each calendar in a file: one unlabelled
+    calendar for an MCP export, or one per person for an aggregate. Each
+    group's events must be consumed before moving on to the next group.
+    """
+    if not is_aggregate(filepath):
+        yield "", map(Event.from_dict, iter_calendar_events(filepath))
+        return
+    with open(filepath, "r", encoding="utf-8") as f:
+        reader = JsonStreamReader.from_file(f)
+        for label in reader.iter_object():
+            events = _iter_event_array(reader)
+            yield label, map(Event.from_dict, events)
+            # Finish the person's list so the reader can continue
+            for _ in events:
+                pass
 
 
 def load_calendar_json(filepath: str) -> list[dict]:
     """Load and extract events from calendar JSON file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Handle the MCP response format: array with text blocks
-    events = []
-    for item in data:
-        if isinstance(item, dict) and item.get("type") == "text":
-            text = item.get("text", "")
-            # Skip date context messages
-            if text.startswith("{"):
-                try:
-                    parsed = json.loads(text)
-                    if "events" in parsed:
-                        events.extend(parsed["events"])
-                except json.JSONDecodeError:
-                    continue
-
-    return events
-
-
-def format_event_summary(event: dict) -> str:
+    return list(iter_calendar_events(filepath))
+
+
+def load_events(filepath: str) -> list[Event]:
+    """Load a calendar JSON file and parse every event once."""
+    return [Event.from_dict(event) for event in load_calendar_json(filepath)]
+
+
+def load_cached_events(filepath: str, cache_dir: str = None) -> Optional[Sequence[Event]]:
+    """
+    Load parsed events through the on-disk cache, parsing the file only on a miss.
+    Returns None if the cache can't be used.
+    """
+    kind = "parse_calendar:" + "|".join(OUTLOOK_FORMATS)
+    cache = open_cache(filepath, kind, lambda: [("", map(Event.from_dict, iter_calendar_events(filepath)))],
+                       cache_dir)
+    if cache is None:
+        return None
+    return cache.groups[0][1]
+
+
+def load_sources(filepath: str, use_cache: bool = True, cache_dir: str = None) -> list[tuple]:
+    """
+    Load the (label, events) calendars of a file, through the on-disk cache
+    unless use_cache is off or the cache can't be used. An MCP export is one
+    calendar labelled with the file name; an aggregate has one per person.
+    """
+    groups = None
+    if use_cache:
+        if is_aggregate(filepath):
+            kind = "parse_calendar:sources:" + "|".join(OUTLOOK_FORMATS)
+            cache = open_cache(filepath, kind, lambda: iter_calendar_sources(filepath), cache_dir)
+            if cache is not None:
+                groups = cache.groups
+        else:
+            events = load_cached_events(filepath, cache_dir)
+            if events is not None:
+                groups = [("", events)]
+    if groups is None:
+        groups = [(label, list(events)) for label, events in iter_calendar_sources(filepath)]
+    default_label = os.path.splitext(os.path.basename(filepath))[0]
+    return [(label or default_label, events) for label, events in groups]
+
+
+class SourcedEvent(Event):
+    """An event merged from one or more calendars, with the labels of the calendars it is on."""
+
+    __slots__ = ("sources", "_event")
+
+    def __init__(self, event: Event, sources: list[str]):
+        self.start = event.start
+        self.end = event.end
+        self.status = event.status
+        self.subject = event.subject
+        self.location = event.location
+        self.sources = sources
+        self._event = event
+
+    @property
+    def raw(self) -> dict:
+        # Cached events decode their raw dict only when it is needed
+        return self._event.raw
+
+
+def _tag_source(label: str, events: Iterable[Event]) -> Iterator[tuple]:
+    for event in events:
+        yield event, label
+
+
+def merge_sources(sources: list[tuple]) -> Iterator[SourcedEvent]:
+    """
+    Lazily k-way merge (label, events by start) calendars into one stream by start.
+
+    The same meeting on several calendars (same start, end, subject and
+    organizer) comes out once, listing every calendar it was on. Duplicates
+    are found through a hash index of the events at the current start time,
+    so only those are held in memory. The organizer is only looked up when
+    the other fields match.
+    """
+    pending = []
+    index = {}
+    current = None
+    merged = heapq.merge(*(_tag_source(label, events) for label, events in sources),
+                         key=lambda item: item[0].start)
+    for event, label in merged:
+        if event.start != current:
+            yield from pending
+            pending = []
+            index = {}
+            current = event.start
+        candidates = index.setdefault((event.end, event.subject), [])
+        organizer = None
+        for existing in candidates:
+            if organizer is None:
+                organizer = str(event.get("organizer"))
+            if str(existing.get("organizer")) == organizer:
+                if label not in existing.sources:
+                    existing.sources.append(label)
+                break
+        else:
+            merged_event = SourcedEvent(event, [label])
+            candidates.append(merged_event)
+            pending.append(merged_event)
+    yield from pending
+
+
+def event_json(event: Event) -> dict:
+    """The original event dict for JSON output, with the calendars a merged event came from."""
+    sources = getattr(event, "sources", None)
+    if sources is None:
+        return event.raw
+    return {**event.raw, "sources": sources}
+
+
+def format_event_summary(event: Event) -> str:
     """Format event in summary format: TIME - TIME: Subject [Status] @ Location"""
-    try:
-        start = parse_event_datetime(event["start"])
-        end = parse_event_datetime(event["end"])
-        start_time = format_time(start)
-        end_time = format_time(end)
-    except ValueError:
+    if event.start is not None and event.end is not None:
+        start_time = format_time(event.start)
+        end_time = format_time(event.end)
+    else:
         start_time = event.get("start", "?")
         end_time = event.get("end", "?")
 
-    subject = event.get("subject", "(No subject)")
-    status = get_status_indicator(event.get("busyStatus", "Busy"))
-    location = event.get("location", "")
+    subject = event.subject if event.subject is not None else "(No subject)"
+    status = get_status_indicator(event.status_name)
+    location = event.location
 
     line = f"- {start_time} - {end_time}: {subject} {status}"
     if location and location.strip():
         line += f" @ {location}"
 
+    sources = getattr(event, "sources", None)
+    if sources:
+        line += f" | {', '.join(sources)}"
+
     return line
 
 
-def format_event_detailed(event: dict) -> str:
+def format_event_detailed(event: Event) -> str:
     """Format event with additional details."""
     lines = [format_event_summary(event)]
 
@@ -145,7 +491,7 @@ def format_event_detailed(event: dict) -> str:
     return "\n".join(lines)
 
 
-def format_output(events: list[dict], format_type: str, target_date: datetime = None) -> str:
+def format_output(events: list[Event], format_type: str, target_date: datetime = None) -> str:
     """Format events grouped by time of day."""
     if not events:
         date_str = target_date.strftime("%m/%d/%Y") if target_date else "specified range"
@@ -161,16 +507,14 @@ def format_output(events: list[dict], format_type: str, target_date: datetime =
             timed.append(event)
 
     # Sort timed events by start time
-    timed.sort(key=lambda e: parse_event_datetime(e["start"]))
+    timed.sort(key=lambda e: e.start)
 
     # Group by time of day
     groups = {"All Day": all_day, "Morning": [], "Afternoon": [], "Evening": []}
     for event in timed:
-        try:
-            start = parse_event_datetime(event["start"])
-            tod = get_time_of_day(start)
-            groups[tod].append(event)
-        except ValueError:
+        if event.start is not None:
+            groups[get_time_of_day(event.start)].append(event)
+        else:
             groups["Morning"].append(event)  # Default fallback
 
     # Build output
@@ -186,44 +530,285 @@ def format_output(events: list[dict], format_type: str, target_date: datetime =
     return "\n".join(output_lines).strip()
 
 
+def format_day(day: datetime, events: list[Event], format_type: str) -> str:
+    """Format one day's events under a date heading, grouped by time of day."""
+    return f"## {day.strftime('%a %m/%d/%Y')}\n\n{format_output(events, format_type, day)}"
+
+
+def parse_query(query: dict, default_format: str = "summary", default_json: bool = False) -> tuple:
+    """
+    Validate one batch query like {"date": "MMDDYYYY"} or {"range": ["MMDDYYYY", "MMDDYYYY"]},
+    with optional "format" and "json" keys.
+    Returns (start_date, end_date, target_date, format_type, as_json).
+    """
+    if not isinstance(query, dict):
+        raise ValueError("Query must be a JSON object")
+    if query.get("date"):
+        start_date = end_date = target_date = parse_date_arg(query["date"])
+    elif query.get("range"):
+        if not isinstance(query["range"], list) or len(query["range"]) != 2:
+            raise ValueError("range must be [START, END]")
+        start_date = parse_date_arg(query["range"][0])
+        end_date = parse_date_arg(query["range"][1])
+        target_date = None
+    else:
+        raise ValueError("Either date or range is required")
+    format_type = query.get("format", default_format)
+    if format_type not in ("summary", "detailed"):
+        raise ValueError(f"Unknown format: {format_type}")
+    return start_date, end_date, target_date, format_type, bool(query.get("json", default_json))
+
+
+def run_query(index: DayIndex, query: dict, default_format: str = "summary", default_json: bool = False,
+              profiler: PhaseProfiler = DISABLED) -> dict:
+    """Answer one batch query against an index, returning a JSON-serializable result object."""
+    try:
+        start_date, end_date, target_date, format_type, as_json = parse_query(query, default_format, default_json)
+    except (ValueError, TypeError) as e:
+        return {"query": query, "error": str(e)}
+
+    with profiler.phase("filter"):
+        filtered = index.query(start_date, end_date)
+    if as_json:
+        return {"query": query, "events": [e.raw for e in filtered]}
+    with profiler.phase("format_output"):
+        return {"query": query, "output": format_output(filtered, format_type, target_date)}
+
+
+def iter_batch_results(index: DayIndex, queries: list[dict], lines: Iterator[str],
+                       default_format: str = "summary", default_json: bool = False,
+                       profiler: PhaseProfiler = DISABLED) -> Iterator[dict]:
+    """Answer the given queries, then one newline-delimited JSON query per line."""
+    for query in queries:
+        yield run_query(index, query, default_format, default_json, profiler)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"query": line, "error": f"Invalid JSON query: {e}"}
+            continue
+        yield run_query(index, query, default_format, default_json, profiler)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Parse Outlook calendar JSON exports")
-    parser.add_argument("file", help="Path to calendar JSON file")
-    parser.add_argument("--date", metavar="MMDDYYYY", help="Filter by single date")
-    parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="Filter by date range (MMDDYYYY MMDDYYYY)")
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="Calendar JSON file(s): MCP exports or a {\"Person\": [events]} aggregate")
+    parser.add_argument("--date", metavar="MMDDYYYY", action="append", default=[],
+                        help="Filter by single date (repeat for several queries)")
+    parser.add_argument("--range", nargs=2, metavar=("START", "END"), action="append", default=[],
+                        help="Filter by date range (MMDDYYYY MMDDYYYY, repeat for several queries)")
     parser.add_argument("--format", choices=["summary", "detailed"], default="summary", help="Output format")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print each day's events as soon as that day is complete (NDJSON with --json)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Also read newline-delimited JSON queries from stdin; print one JSON result per line")
+    parser.add_argument("--no-cache", action="store_true", help="Always parse the file, bypassing the cache")
+    parser.add_argument("--cache-dir", help="Directory for parsed-calendar cache files")
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
 
-    if not args.date and not args.range:
+    queries = [{"date": date} for date in args.date] + [{"range": list(r)} for r in args.range]
+    if not queries and not args.batch:
         parser.error("Either --date or --range is required")
+    batch = args.batch or len(queries) > 1
+    if batch and args.stream:
+        parser.error("--stream takes a single --date or --range query")
+    if batch and (len(args.files) > 1 or is_aggregate_arg(args.files[0])):
+        parser.error("--batch takes a single calendar export")
 
     # Parse date filters
-    if args.date:
-        start_date = parse_date_arg(args.date)
-        end_date = start_date
-    else:
-        start_date = parse_date_arg(args.range[0])
-        end_date = parse_date_arg(args.range[1])
+    dates = None
+    if not batch:
+        try:
+            dates = parse_query(queries[0])[:3]
+        except ValueError as e:
+            parser.error(str(e))
+
+    profiler = profiler_from_args(args)
+    try:
+        run(args, queries, dates, profiler)
+    finally:
+        finish_profile(profiler, args)
+
+
+def is_aggregate_arg(filepath: str) -> bool:
+    """is_aggregate for a command-line file, exiting if it can't be read."""
+    with exit_on_load_error(filepath):
+        return is_aggregate(filepath)
 
-    # Load and filter events
+
+@contextmanager
+def exit_on_load_error(filepath: str):
+    """Report a missing or malformed calendar file and exit."""
     try:
-        events = load_calendar_json(args.file)
+        yield
     except FileNotFoundError:
-        print(f"Error: File not found: {args.file}", file=sys.stderr)
+        print(f"Error: File not found: {filepath}", file=sys.stderr)
         sys.exit(1)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON: {e}", file=sys.stderr)
         sys.exit(1)
 
-    filtered = [e for e in events if event_in_date_range(e, start_date, end_date)]
+
+def run(args: argparse.Namespace, queries: list[dict], dates: Optional[tuple], profiler: PhaseProfiler):
+    """
+    Load the calendar and print the results for the command line.
+    dates is (start_date, end_date, target_date) for a single query, or None in batch mode.
+    """
+    batch = dates is None
+    if not batch:
+        start_date, end_date, target_date = dates
+        if len(args.files) > 1 or is_aggregate_arg(args.files[0]):
+            run_sources(args, start_date, end_date, target_date, profiler)
+            return
+        if args.stream:
+            run_stream(args, start_date, end_date, target_date, profiler)
+            return
+
+    # Load events from the cache, or stream and filter them as they are parsed
+    with exit_on_load_error(args.files[0]):
+        events = None
+        if not args.no_cache:
+            with profiler.phase("load_cached_events"):
+                events = load_cached_events(args.files[0], args.cache_dir)
+        if batch:
+            if events is None:
+                with profiler.phase("load_calendar_json"):
+                    events = load_events(args.files[0])
+            with profiler.phase("index"):
+                index = DayIndex(events)
+        elif events is not None:
+            with profiler.phase("index"):
+                index = DayIndex(events)
+            with profiler.phase("filter"):
+                filtered = index.query(start_date, end_date)
+        else:
+            # Loading, parsing and filtering are one streamed pass here
+            with profiler.phase("load_and_filter") as phase:
+                filtered = []
+                for event in map(Event.from_dict, iter_calendar_events(args.files[0])):
+                    if phase is not None:
+                        phase.calls += 1
+                    if event_in_date_range(event, start_date, end_date):
+                        filtered.append(event)
+
+    # Batch output: one result object per query, written as soon as it is answered
+    if batch:
+        lines = sys.stdin if args.batch else iter(())
+        for result in iter_batch_results(index, queries, lines, args.format, args.json, profiler):
+            with profiler.phase("output"):
+                print(json.dumps(result), flush=True)
+        return
 
     # Output
     if args.json:
-        print(json.dumps(filtered, indent=2))
+        with profiler.phase("output"):
+            print(json.dumps([e.raw for e in filtered], indent=2))
+    else:
+        with profiler.phase("format_output"):
+            output = format_output(filtered, args.format, target_date)
+        with profiler.phase("output"):
+            print(output)
+
+
+def print_days(days: Iterator[tuple], args: argparse.Namespace, target_date: Optional[datetime],
+               to_json: Callable[[Event], dict], phase=None):
+    """
+    Write --stream output for iter_days' (day, events) pairs as each day
+    arrives, using to_json for the events of --json lines. phase, if given,
+    counts the days printed.
+    """
+    found = False
+    for day, day_events in days:
+        if phase is not None:
+            phase.calls += 1
+        if args.json:
+            print(json.dumps({"date": day.strftime("%m%d%Y"), "events": [to_json(e) for e in day_events]}),
+                  flush=True)
+        else:
+            print(("\n" if found else "") + format_day(day, day_events, args.format), flush=True)
+        found = True
+    if not found and not args.json:
+        print(format_output([], args.format, target_date))
+
+
+def run_stream(args: argparse.Namespace, start_date: datetime, end_date: datetime, target_date: Optional[datetime],
+               profiler: PhaseProfiler):
+    """
+    Print one query day by day (--stream): a heading and time-of-day groups
+    per day, or one {"date", "events"} JSON line per day with --json.
+    Each day is written as soon as it is complete, and memory doesn't grow
+    with the length of the range. From the cache, output starts immediately.
+    Uncached, the export is first read once just to check that it is in day
+    order, which Outlook's are, so that an unordered one can be indexed
+    instead and still give the same output; first output then waits for that
+    pass, about as long as reading the file (~1s for a year of 80k events).
+    """
+    with exit_on_load_error(args.files[0]):
+        events = None
+        if not args.no_cache:
+            with profiler.phase("load_cached_events"):
+                events = load_cached_events(args.files[0], args.cache_dir)
+        if events is not None:
+            with profiler.phase("index"):
+                index = DayIndex(events)
+            source = index.iter_range(start_date, end_date)
+        else:
+            # Stream lazily only if the export is in day order. Only starts are
+            # parsed here, so the second pass mostly finds them in the parse memo
+            with profiler.phase("check_order"):
+                in_order = starts_in_day_order(parse_minutes(event.get("start"))
+                                               for event in iter_calendar_events(args.files[0]))
+            if in_order:
+                source = map(Event.from_dict, iter_calendar_events(args.files[0]))
+            else:
+                with profiler.phase("load_calendar_json"):
+                    events = load_events(args.files[0])
+                with profiler.phase("index"):
+                    source = DayIndex(events).iter_range(start_date, end_date)
+
+        with profiler.phase("stream_output", 0) as phase:
+            print_days(iter_days(source, start_date, end_date), args, target_date, lambda e: e.raw, phase)
+
+
+def run_sources(args: argparse.Namespace, start_date: datetime, end_date: datetime,
+                target_date: Optional[datetime], profiler: PhaseProfiler):
+    """
+    Print one query over several calendars (files, or the people in an
+    aggregate) as a single agenda. Each calendar is filtered and ordered by
+    start on its own, then they are merged lazily with merge_sources.
+    """
+    sources = []
+    for filepath in args.files:
+        with exit_on_load_error(filepath):
+            with profiler.phase("load_sources"):
+                groups = load_sources(filepath, not args.no_cache, args.cache_dir)
+        with profiler.phase("index", len(groups)):
+            for label, events in groups:
+                sources.append((label, DayIndex(events).iter_range(start_date, end_date)))
+
+    merged = merge_sources(sources)
+    if args.stream:
+        with profiler.phase("stream_output", 0) as phase:
+            print_days(iter_days(merged, start_date, end_date), args, target_date, event_json, phase)
+        return
+
+    with profiler.phase("merge"):
+        filtered = list(merged)
+    if args.json:
+        with profiler.phase("output"):
+            print(json.dumps([event_json(e) for e in filtered], indent=2))
     else:
-        print(format_output(filtered, args.format, start_date if args.date else None))
+        with profiler.phase("format_output"):
+            output = format_output(filtered, args.format, target_date)
+        with profiler.phase("output"):
+            print(output)
 
 
 if __name__ == "__main__":
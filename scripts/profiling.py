@@ -0,0 +1,190 @@
+"""
+profiling.py - Per-phase timing and memory instrumentation for the calendar scripts.
+
+PhaseProfiler records wall time, call counts and peak traced memory for each
+named pipeline phase (JSON load, parsing, filtering, slot scoring, sorting,
+formatting, ...) and can also run the whole command under cProfile. Scripts
+wrap their phases unconditionally; a disabled profiler's phase() does nothing,
+so runs without --profile pay no measurable cost.
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Hot functions listed in the text report when cProfile is on
+CPROFILE_TOP = 15
+
+
+class PhaseStats:
+    """Accumulated measurements for one named phase."""
+
+    __slots__ = ("name", "calls", "seconds", "peak_bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_bytes = 0
+
+    def to_json(self) -> dict:
+        return {"name": self.name, "calls": self.calls, "seconds": self.seconds,
+                "peak_bytes": self.peak_bytes}
+
+
+class PhaseProfiler:
+    """
+    Collects PhaseStats for the phases of one run.
+
+    peak_bytes is the highest traced memory above the level at phase entry,
+    so it measures what the phase itself allocated. Memory tracing slows
+    allocation-heavy phases several times over; pass trace_memory=False for
+    representative timings.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True, cprofile: bool = False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.phases = {}
+        self._stack = []
+        self._profile = cProfile.Profile() if enabled and cprofile else None
+        self._started = None
+        self._total = 0.0
+        self._peak_total = 0
+
+    def start(self):
+        """Begin measuring the whole run."""
+        if not self.enabled:
+            return
+        if self.trace_memory:
+            tracemalloc.start()
+        if self._profile is not None:
+            self._profile.enable()
+        self._started = time.perf_counter()
+
+    def stop(self):
+        """Finish measuring the whole run."""
+        if not self.enabled or self._started is None:
+            return
+        self._total = time.perf_counter() - self._started
+        self._started = None
+        if self._profile is not None:
+            self._profile.disable()
+        if self.trace_memory:
+            self._peak_total = max(self._peak_total, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str, calls: int = 1) -> Iterator[Optional[PhaseStats]]:
+        """
+        Measure the enclosed block as one run of phase name, adding calls to its call count.
+        Yields the phase's PhaseStats (None when disabled) so the block can count calls it
+        only learns about as it runs.
+        """
+        if not self.enabled:
+            yield None
+            return
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats(name)
+        stats.calls += calls
+
+        base = 0
+        if self.trace_memory:
+            base, peak = tracemalloc.get_traced_memory()
+            # Keep the run's and the enclosing phase's peaks before resetting it for this one
+            self._peak_total = max(self._peak_total, peak)
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        frame = [stats, 0]
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - started
+            self._stack.pop()
+            if self.trace_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], frame[1])
+                stats.peak_bytes = max(stats.peak_bytes, peak - base)
+                self._peak_total = max(self._peak_total, peak)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+
+    def report(self) -> dict:
+        """Return the measurements as a JSON-serializable dict."""
+        return {
+            "total_seconds": self._total,
+            "peak_bytes": self._peak_total if self.trace_memory else None,
+            "phases": [stats.to_json() for stats in self.phases.values()],
+        }
+
+    def format_report(self) -> str:
+        """Return the measurements as a human-readable table."""
+        lines = [f"{'phase':<24} {'calls':>9} {'seconds':>10} {'share':>7} {'peak KiB':>10}"]
+        for stats in self.phases.values():
+            share = stats.seconds / self._total * 100 if self._total else 0.0
+            peak = f"{stats.peak_bytes / 1024:10.1f}" if self.trace_memory else f"{'-':>10}"
+            lines.append(f"{stats.name:<24} {stats.calls:>9} {stats.seconds:>10.4f} {share:>6.1f}% {peak}")
+        peak = f"{self._peak_total / 1024:10.1f}" if self.trace_memory else f"{'-':>10}"
+        lines.append(f"{'total':<24} {'':>9} {self._total:>10.4f} {'':>7} {peak}")
+        if self._profile is not None:
+            out = io.StringIO()
+            pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(CPROFILE_TOP)
+            lines.append(out.getvalue().rstrip())
+        return "\n".join(lines)
+
+    def write_report(self, sidecar: str = None):
+        """Write the report as JSON to sidecar, or as a table to stderr."""
+        if not self.enabled:
+            return
+        if sidecar:
+            with open(sidecar, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        else:
+            print(self.format_report(), file=sys.stderr)
+
+    def dump_cprofile(self, path: str):
+        """Save the cProfile data for pstats / snakeviz."""
+        if self._profile is not None:
+            self._profile.dump_stats(path)
+
+
+# Shared disabled profiler for callers that don't pass one
+DISABLED = PhaseProfiler()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Add the --profile family of options to a script's argument parser."""
+    parser.add_argument("--profile", action="store_true",
+                        help="Report per-phase wall time, call counts and peak memory to stderr")
+    parser.add_argument("--profile-output", metavar="FILE",
+                        help="Write the --profile report as JSON to FILE instead of stderr")
+    parser.add_argument("--profile-no-memory", action="store_true",
+                        help="Skip memory tracing, which can slow the profiled run 10x")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="Also run under cProfile and save its stats to FILE")
+
+
+def profiler_from_args(args: argparse.Namespace) -> PhaseProfiler:
+    """Build a started profiler from parsed --profile options."""
+    enabled = bool(args.profile or args.profile_output or args.cprofile)
+    profiler = PhaseProfiler(enabled, trace_memory=not args.profile_no_memory, cprofile=bool(args.cprofile))
+    profiler.start()
+    return profiler
+
+
+def finish_profile(profiler: PhaseProfiler, args: argparse.Namespace):
+    """Stop the profiler and write the outputs requested on the command line."""
+    profiler.stop()
+    profiler.write_report(args.profile_output)
+    if args.cprofile:
+        profiler.dump_cprofile(args.cprofile)
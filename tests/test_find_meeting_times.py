@@ -0,0 +1,180 @@
+"""Tests that the grid and incremental rankings match brute-force analyze_slot on random calendars."""
+
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import find_meeting_times as fmt  # noqa: E402
+from calendar_model import from_minutes, to_minutes  # noqa: E402
+
+START = datetime(2026, 2, 2)
+DAYS = 10
+START_DATE = START.strftime('%m%d%Y')
+END_DATE = (START + timedelta(days=DAYS - 1)).strftime('%m%d%Y')
+STATUSES = ['Busy', 'Busy', 'Tentative', 'Tentative', 'Free', 'Out of Office', 'WorkingElsewhere']
+FREE_BUSY_DIGITS = '0000001234'
+# (duration, step) pairs, so grids of several resolutions are exercised
+SLOT_SHAPES = [(25, 5), (30, 30), (60, 15), (90, 30)]
+SEEDS = range(6)
+TOP = 8
+
+
+def format_time(dt: datetime) -> str:
+    return dt.strftime('%m/%d/%Y %I:%M %p')
+
+
+def random_events(rng: random.Random, count: int) -> list:
+    """
+    Raw events with overlapping tentative and busy meetings, zero-length and
+    inverted events, and multi-day out-of-office blocks.
+    """
+    events = []
+    while len(events) < count:
+        start = START + timedelta(days=rng.randrange(DAYS), minutes=rng.randrange(7 * 60, 19 * 60))
+        status = rng.choice(STATUSES)
+        kind = rng.random()
+        if kind < 0.05:
+            start = START + timedelta(days=rng.randrange(-1, DAYS))
+            end = start + timedelta(days=rng.randint(2, 4))
+            status = 'Out of Office'
+        elif kind < 0.1:
+            end = start
+        elif kind < 0.15:
+            end = start - timedelta(minutes=rng.choice([15, 30, 90]))
+        else:
+            end = start + timedelta(minutes=rng.choice([10, 25, 30, 45, 60, 90, 240]))
+        events.append({'subject': f'Event {len(events)}', 'start': format_time(start),
+                       'end': format_time(end), 'busyStatus': status})
+        if kind > 0.8:
+            # A tentative hold overlapping the meeting just added
+            overlap = start + timedelta(minutes=rng.randrange(-30, 30))
+            events.append({'subject': f'Hold {len(events)}', 'start': format_time(overlap),
+                           'end': format_time(overlap + timedelta(minutes=rng.choice([30, 60]))),
+                           'busyStatus': rng.choice(['Tentative', 'Busy'])})
+    return events
+
+
+def random_free_busy(rng: random.Random) -> fmt.FreeBusy:
+    """A free/busy string starting off the slot grid, at a resolution that doesn't divide it."""
+    start = to_minutes(START) + rng.randrange(-600, 600)
+    minutes_per_char = rng.choice([7, 15, 30])
+    length = DAYS * 24 * 60 // minutes_per_char
+    return fmt.FreeBusy(start, minutes_per_char, ''.join(rng.choice(FREE_BUSY_DIGITS) for _ in range(length)))
+
+
+def random_people(rng: random.Random, people: int = 8, free_busy: int = 2) -> dict:
+    calendars = {f'P{i}': fmt.get_busy_periods(random_events(rng, rng.randrange(0, 50))) for i in range(people)}
+    for i in range(free_busy):
+        calendars[f'FB{i}'] = random_free_busy(rng)
+    return calendars
+
+
+def brute_force_top(slots: list, people: dict, my_busy_periods: list = None, top: int = TOP) -> list:
+    """The original ranking: analyze every slot, sort by available_count then start."""
+    results = [fmt.analyze_slot(start, end, people, my_busy_periods) for start, end in slots]
+    results.sort(key=lambda r: (-r['available_count'], r['start']))
+    return results[:top]
+
+
+class AvailabilityGridTest(unittest.TestCase):
+
+    def test_score_slots_matches_analyze_slot(self):
+        for seed in SEEDS:
+            people = random_people(random.Random(seed))
+            for duration, step in SLOT_SHAPES:
+                slots = fmt.generate_time_slots(START_DATE, END_DATE, duration, 8, 18, step)
+                with self.subTest(seed=seed, duration=duration, step=step):
+                    expected = [fmt.analyze_slot(start, end, people)['available_count'] for start, end in slots]
+                    self.assertEqual(fmt.score_slots(slots, people), expected)
+
+    def test_find_top_slots_matches_brute_force_ranking(self):
+        for seed in SEEDS:
+            rng = random.Random(seed)
+            people = random_people(rng)
+            my_busy_periods = fmt.get_busy_periods(random_events(rng, 30))
+            slots_by_duration = {duration: fmt.generate_time_slots(START_DATE, END_DATE, duration, 8, 18, step)
+                                 for duration, step in SLOT_SHAPES}
+            # One shared grid for every duration, as the command line uses
+            by_duration = fmt.find_top_slots_by_duration(slots_by_duration, people, my_busy_periods, TOP)
+            for duration, slots in slots_by_duration.items():
+                with self.subTest(seed=seed, duration=duration):
+                    expected = brute_force_top(slots, people, my_busy_periods)
+                    self.assertEqual(fmt.find_top_slots(slots, people, my_busy_periods, TOP), expected)
+                    self.assertEqual(by_duration[duration], expected)
+
+    def test_recurring_scores_match_analyze_recurring_slot(self):
+        for seed in SEEDS:
+            people = random_people(random.Random(seed))
+            for weeks in (1, 2):
+                first_week = (START + timedelta(days=6)).strftime('%m%d%Y')
+                slots_by_duration = {duration: fmt.generate_time_slots(START_DATE, first_week, duration, 8, 18, step)
+                                     for duration, step in SLOT_SHAPES}
+                results = fmt.find_recurring_slots(slots_by_duration, weeks, people, top=TOP)
+                for duration, slots in slots_by_duration.items():
+                    with self.subTest(seed=seed, weeks=weeks, duration=duration):
+                        expected = [fmt.analyze_recurring_slot(start, end, weeks, people) for start, end in slots]
+                        grid = fmt.AvailabilityGrid.for_slots(
+                            [(start + timedelta(weeks=week), end + timedelta(weeks=week))
+                             for start, end in slots for week in range(weeks)])
+                        for person, periods in people.items():
+                            grid.add_person(person, periods)
+                        scores, every_week = grid.recurring_scores(slots, weeks)
+                        self.assertEqual(scores, [r['available_count'] for r in expected])
+                        self.assertEqual(every_week, [len(r['every_week']) for r in expected])
+
+                        expected.sort(key=lambda r: (-len(r['every_week']), -r['available_count'], r['start']))
+                        self.assertEqual(results[duration], expected[:TOP])
+
+
+class SlotBoardTest(unittest.TestCase):
+
+    QUERIES = [(START_DATE, END_DATE, 60, 9, 17, 30),
+               (START_DATE, (START + timedelta(days=2)).strftime('%m%d%Y'), 25, 8, 18, 5)]
+
+    def assert_matches_brute_force(self, service: fmt.SchedulingService):
+        for query in self.QUERIES:
+            start, end, duration, work_start, work_end, step = query
+            slots = fmt.generate_time_slots(*query)
+            results = [fmt.analyze_slot(slot_start, slot_end, service.people_busy_periods)
+                       for slot_start, slot_end in slots]
+            top = service.find_slots(start, end, duration, TOP, work_start, work_end, step)
+            # Every slot's incrementally kept score, not just the ones that reach the top
+            board = service._boards[query]
+            self.assertEqual([board.score(i) for i in range(len(slots))], [r['available_count'] for r in results])
+            results.sort(key=lambda r: (-r['available_count'], r['start']))
+            self.assertEqual(top, [fmt.slot_result_to_json(r) for r in results[:TOP]])
+
+    def test_top_slots_after_updates(self):
+        for seed in SEEDS:
+            rng = random.Random(seed)
+            service = fmt.SchedulingService(random_people(rng, people=6, free_busy=1))
+            names = [f'P{i}' for i in range(8)] + ['FB0']
+            with self.subTest(seed=seed, step='initial'):
+                self.assert_matches_brute_force(service)
+            for step in range(30):
+                name = rng.choice(names)
+                action = rng.random()
+                if action < 0.1:
+                    service.remove_person(name)
+                elif action < 0.25:
+                    service.set_person(name, random_events(rng, rng.randrange(0, 30)))
+                elif action < 0.35:
+                    free_busy = random_free_busy(rng)
+                    service.set_free_busy(name, free_busy.digits, format_time(from_minutes(free_busy.start)),
+                                          free_busy.minutes_per_char)
+                elif isinstance(service.people_busy_periods.get(name), fmt.FreeBusy):
+                    continue
+                else:
+                    periods = service.people_busy_periods.get(name, [])
+                    remove = [{'subject': p.subject} for p in periods if rng.random() < 0.3]
+                    service.patch_person(name, random_events(rng, rng.randrange(0, 4)), remove)
+                with self.subTest(seed=seed, step=step):
+                    self.assert_matches_brute_force(service)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Tests for the incremental JsonStreamReader, splitting the input at every offset."""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from json_stream import JsonStreamReader  # noqa: E402
+
+DOCUMENTS = [
+    # Surrogate pairs as json.dump writes them (ensure_ascii), mixed with other escapes
+    json.dumps([{"subject": "Launch \U0001F680 party \U0001F389", "n": 1}]),
+    json.dumps({"text": "\U0001F600\U0001F601", "a": "\\\\ud83c", "b": "tab\there \"q\" é /"}),
+    r'["🎉", "\\ud83c", "\\🎉", "lone \ud83c", "\ud83c"]',
+    json.dumps([0, -1, 12345678901234567890, 3.25, -0.5e-10, 1E+3, True, False, None]),
+    '{"nested": [[], {}, [1, [2, [3]]], {"k": {"v": "x"}}], "empty": ""}',
+    '\n  [ 1 ,\n  "two" , { "three" : 3 } ]  \n',
+]
+
+
+def walk(reader: JsonStreamReader):
+    """Rebuild a value through the streaming API, using iter_string for every string."""
+    char = reader.peek()
+    if char == '"':
+        return "".join(reader.iter_string())
+    if char == "[":
+        return [walk(reader) for _ in reader.iter_array()]
+    if char == "{":
+        return {key: walk(reader) for key in reader.iter_object()}
+    return reader.read_value()
+
+
+def split_at(text: str, offset: int) -> list:
+    return [text[:offset], text[offset:]]
+
+
+class JsonStreamReaderTest(unittest.TestCase):
+
+    def test_walk_matches_json_loads_at_every_split(self):
+        for document in DOCUMENTS:
+            expected = json.loads(document)
+            for offset in range(len(document) + 1):
+                with self.subTest(document=document, offset=offset):
+                    self.assertEqual(walk(JsonStreamReader(split_at(document, offset))), expected)
+
+    def test_read_value_matches_json_loads_at_every_split(self):
+        for document in DOCUMENTS:
+            expected = json.loads(document)
+            for offset in range(len(document) + 1):
+                with self.subTest(document=document, offset=offset):
+                    self.assertEqual(JsonStreamReader(split_at(document, offset)).read_value(), expected)
+
+    def test_one_character_chunks(self):
+        for document in DOCUMENTS:
+            with self.subTest(document=document):
+                self.assertEqual(walk(JsonStreamReader(iter(document))), json.loads(document))
+
+    def test_surrogate_pair_is_never_split(self):
+        document = json.dumps(["x" * 7 + "\U0001F389" * 3])
+        for offset in range(len(document) + 1):
+            with self.subTest(offset=offset):
+                reader = JsonStreamReader(split_at(document, offset))
+                for _ in reader.iter_array():
+                    for piece in reader.iter_string():
+                        # Every piece must encode on its own, so no lone surrogate halves
+                        piece.encode("utf-8")
+
+    def test_skip_value(self):
+        document = '[{"skip": ["\\ud83c\\udf89", 1.5, {"a": null}]}, "keep"]'
+        for offset in range(len(document) + 1):
+            with self.subTest(offset=offset):
+                reader = JsonStreamReader(split_at(document, offset))
+                values = []
+                for index, _ in enumerate(reader.iter_array()):
+                    if index == 0:
+                        reader.skip_value()
+                    else:
+                        values.append(reader.read_value())
+                self.assertEqual(values, ["keep"])
+
+    def test_errors_report_position_in_whole_input(self):
+        cases = [
+            ('[1,\n 2,\n "abc', "Unterminated string"),
+            ('[1,\n 2\n 3]', "Expecting ',' delimiter"),
+            ('{"a": 1,\n "b": tru}', "Expecting value"),
+        ]
+        for document, message in cases:
+            expected_pos = None
+            try:
+                json.loads(document)
+            except json.JSONDecodeError as e:
+                expected_pos = (e.pos, e.lineno, e.colno)
+            for chunk_size in (1, 2, 3, 5, len(document)):
+                chunks = [document[i:i + chunk_size] for i in range(0, len(document), chunk_size)]
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError) as caught:
+                        walk(JsonStreamReader(chunks))
+                    error = caught.exception
+                    self.assertTrue(error.msg.startswith(message), error.msg)
+                    self.assertEqual((error.pos, error.lineno, error.colno), expected_pos)
+
+
+if __name__ == "__main__":
+    unittest.main()